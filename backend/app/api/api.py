@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.endpoints import auth, users, restaurants, orders, employees, requests, notifications, time_clock, service_requests, reports, menu
+from app.api.endpoints import auth, users, restaurants, orders, employees, requests, notifications, time_clock, service_requests, reports, menu, metrics, events
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
@@ -14,3 +14,5 @@ api_router.include_router(notifications.router, prefix="/notifications", tags=["
 api_router.include_router(time_clock.router, prefix="/time-clock", tags=["time-clock"])
 api_router.include_router(service_requests.router, prefix="/service-requests", tags=["service-requests"])
 api_router.include_router(reports.router, prefix="/reports", tags=["reports"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
+api_router.include_router(events.router, prefix="/events", tags=["events"])
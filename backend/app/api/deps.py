@@ -8,7 +8,7 @@ from sqlalchemy.orm import Session
 from app.core.config import settings
 from app.core import security
 from app.db.session import get_db
-from app.models import User
+from app.models import User, Restaurant
 from app.schemas import TokenPayload
 
 reusable_oauth2 = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
@@ -77,3 +77,18 @@ def get_current_user_optional(
         
     user = db.query(User).filter(User.id == int(token_data.sub)).first()
     return user
+
+def verify_restaurant_staff(db: Session, user: User, restaurant_id: int) -> None:
+    """
+    Raise 403 unless the user owns the restaurant or is one of its employees.
+    """
+    if user.role == "employee" and user.restaurant_id == restaurant_id:
+        return
+    if user.role == "owner":
+        owned = db.query(Restaurant.id).filter(
+            Restaurant.id == restaurant_id,
+            Restaurant.owner_id == user.id
+        ).first()
+        if owned:
+            return
+    raise HTTPException(status_code=403, detail="Not authorized")
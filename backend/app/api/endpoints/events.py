@@ -0,0 +1,83 @@
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from fastapi.security import OAuth2PasswordBearer
+
+from app.core.config import settings
+from app.services.event_stream import stream_events
+from app.services.socket_auth import SocketAuthError, SocketIdentity, can_join, socket_auth_cache
+from app.socket_manager import broker, history
+
+router = APIRouter()
+
+reusable_oauth2_optional = OAuth2PasswordBearer(
+    tokenUrl=f"{settings.API_V1_STR}/auth/login",
+    auto_error=False
+)
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no", # Keep nginx from buffering the stream
+}
+
+async def stream_identity(
+    bearer: Optional[str] = Depends(reusable_oauth2_optional),
+    token: Optional[str] = Query(None, description="Access token, for EventSource clients that cannot send headers"),
+) -> Optional[SocketIdentity]:
+    """
+    Identity for an event stream, verified once per connection through the
+    same cache as Socket.IO connects.
+    """
+    token = bearer or token
+    if not token:
+        return None
+    try:
+        return await asyncio.to_thread(socket_auth_cache.authenticate, token)
+    except SocketAuthError:
+        raise HTTPException(status_code=403, detail="Could not validate credentials")
+
+def open_stream(identity: Optional[SocketIdentity], room: str, last_event_id: Optional[str]) -> StreamingResponse:
+    if not can_join(identity, room):
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+    return StreamingResponse(
+        stream_events(broker, history, [room], last_event_id, settings.SSE_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+@router.get("/restaurants/{restaurant_id}")
+async def stream_restaurant_events(
+    restaurant_id: int,
+    identity: Optional[SocketIdentity] = Depends(stream_identity),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+) -> StreamingResponse:
+    """
+    Server-Sent Events with the realtime events of a restaurant (new orders,
+    order updates, service requests), for its owner and employees.
+    Reconnects resume after `Last-Event-ID`, or get a `resync` event.
+    """
+    return open_stream(identity, f"restaurant_{restaurant_id}", last_event_id)
+
+@router.get("/users/me")
+async def stream_my_events(
+    identity: Optional[SocketIdentity] = Depends(stream_identity),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+) -> StreamingResponse:
+    """
+    Server-Sent Events for the current user (e.g. updates to their orders).
+    """
+    if identity is None:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return open_stream(identity, f"user_{identity.user_id}", last_event_id)
+
+@router.get("/tables/{table_id}")
+async def stream_table_events(
+    table_id: int,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+) -> StreamingResponse:
+    """
+    Server-Sent Events for a table (updates to orders placed at it).
+    Open to anyone, like the table's QR code.
+    """
+    return open_stream(None, f"table_{table_id}", last_event_id)
@@ -1,13 +1,20 @@
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from sqlalchemy.orm import Session
-import shutil
-import uuid
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, selectinload
+import csv
+import gzip
 import os
 
 from app import models, schemas
 from app.api import deps
 from app.db.session import get_db
+from app.core.config import settings
+from app.services.menu_cache import bump_menu_version, cached_menu_response, etag_matches
+from app.services.image_pipeline import process_image_upload
+from app.services.menu_import import export_menu_csv, export_menu_json, import_menu, parse_menu_file
+from app.services.menu_search import search_menu_items
+from app.services.menu_snapshot import get_snapshot
 
 router = APIRouter()
 
@@ -37,6 +44,7 @@ def create_category(
         restaurant_id=restaurant_id
     )
     db.add(category)
+    bump_menu_version(db, restaurant_id)
     db.commit()
     db.refresh(category)
     return category
@@ -44,13 +52,19 @@ def create_category(
 @router.get("/{restaurant_id}/categories", response_model=List[schemas.Category])
 def read_categories(
     restaurant_id: int,
+    request: Request,
     db: Session = Depends(get_db),
 ) -> Any:
     """
-    Get all categories for a restaurant
+    Get all categories for a restaurant (cached per menu version, supports If-None-Match)
     """
-    categories = db.query(models.Category).filter(models.Category.restaurant_id == restaurant_id).all()
-    return categories
+    def build():
+        categories = db.query(models.Category).options(
+            selectinload(models.Category.items)
+        ).filter(models.Category.restaurant_id == restaurant_id).all()
+        return [schemas.Category.model_validate(category) for category in categories]
+
+    return cached_menu_response(request, db, restaurant_id, "categories", build)
 
 # --- Menu Items ---
 
@@ -76,6 +90,7 @@ def create_menu_item(
         restaurant_id=restaurant_id
     )
     db.add(item)
+    bump_menu_version(db, restaurant_id)
     db.commit()
     db.refresh(item)
     return item
@@ -83,13 +98,58 @@ def create_menu_item(
 @router.get("/{restaurant_id}/items", response_model=List[schemas.MenuItem])
 def read_menu_items(
     restaurant_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+) -> Any:
+    """
+    Get all menu items for a restaurant (cached per menu version, supports If-None-Match)
+    """
+    def build():
+        items = db.query(models.MenuItem).filter(models.MenuItem.restaurant_id == restaurant_id).all()
+        return [schemas.MenuItem.model_validate(item) for item in items]
+
+    return cached_menu_response(request, db, restaurant_id, "items", build)
+
+@router.get("/{restaurant_id}/snapshot")
+def read_menu_snapshot(
+    restaurant_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+) -> Any:
+    """
+    Get the whole customer menu in one document: restaurant header, categories
+    and their available items in display order. Served prebuilt and gzip-compressed.
+    """
+    snapshot = get_snapshot(db, restaurant_id)
+    if not snapshot:
+        raise HTTPException(status_code=404, detail="Restaurant not found")
+
+    # Each content coding is its own representation with its own strong ETag
+    gzipped = "gzip" in request.headers.get("accept-encoding", "")
+    headers = {
+        "ETag": f'"snapshot-{restaurant_id}-v{snapshot.version}{"-gzip" if gzipped else ""}"',
+        "Cache-Control": f"public, max-age={settings.MENU_CACHE_MAX_AGE}",
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=snapshot.gzipped, media_type="application/json", headers=headers)
+    return Response(content=gzip.decompress(snapshot.gzipped), media_type="application/json", headers=headers)
+
+@router.get("/{restaurant_id}/search", response_model=List[schemas.MenuItem])
+def search_menu(
+    restaurant_id: int,
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
     db: Session = Depends(get_db),
 ) -> Any:
     """
-    Get all menu items for a restaurant
+    Search a restaurant's menu by item name, category and description.
+    Words match by prefix; results are ranked best match first.
     """
-    items = db.query(models.MenuItem).filter(models.MenuItem.restaurant_id == restaurant_id).all()
-    return items
+    return search_menu_items(db, restaurant_id, q, limit)
 
 @router.put("/items/{item_id}", response_model=schemas.MenuItem)
 def update_menu_item(
@@ -115,6 +175,7 @@ def update_menu_item(
         setattr(item, field, value)
 
     db.add(item)
+    bump_menu_version(db, item.restaurant_id)
     db.commit()
     db.refresh(item)
     return item
@@ -138,6 +199,7 @@ def delete_menu_item(
         raise HTTPException(status_code=400, detail="Not enough permissions")
 
     db.delete(item)
+    bump_menu_version(db, item.restaurant_id)
     db.commit()
     return item
 
@@ -160,17 +222,67 @@ def upload_item_image(
     if restaurant.owner_id != current_user.id:
         raise HTTPException(status_code=400, detail="Not enough permissions")
 
-    # Generate unique filename
-    file_ext = file.filename.split(".")[-1]
-    filename = f"{uuid.uuid4()}.{file_ext}"
-    file_path = f"app/static/images/{filename}"
-    
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-        
-    # Update item image_url
-    item.image_url = f"/static/images/{filename}"
+    # Resized WebP / JPEG variants named by content hash
+    variants = process_image_upload(file)
+    item.image_variants = variants
+    item.image_url = variants["card"]["jpeg"]
     db.add(item)
+    bump_menu_version(db, item.restaurant_id)
     db.commit()
     db.refresh(item)
     return item
+
+# --- Bulk import / export ---
+
+@router.post("/{restaurant_id}/import", response_model=schemas.MenuImportResult)
+def import_menu_file(
+    *,
+    db: Session = Depends(get_db),
+    restaurant_id: int,
+    file: UploadFile = File(...),
+    current_user: models.User = Depends(deps.get_current_active_owner),
+) -> Any:
+    """
+    Bulk create / update categories and menu items from a CSV file or a JSON
+    array (or newline-delimited JSON) of rows with the export's columns.
+    """
+    restaurant = db.query(models.Restaurant).filter(models.Restaurant.id == restaurant_id).first()
+    if not restaurant:
+        raise HTTPException(status_code=404, detail="Restaurant not found")
+    if restaurant.owner_id != current_user.id:
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+
+    rows = parse_menu_file(file.file, file.filename, file.content_type)
+    try:
+        return import_menu(db, restaurant_id, rows)
+    except (ValueError, csv.Error) as e:
+        # Chunks before the malformed part of the file have already been imported
+        raise HTTPException(status_code=400, detail=f"Could not parse import file: {e}")
+
+@router.get("/{restaurant_id}/export")
+def export_menu_file(
+    *,
+    db: Session = Depends(get_db),
+    restaurant_id: int,
+    format: str = Query("csv", pattern="^(csv|json)$"),
+    current_user: models.User = Depends(deps.get_current_active_owner),
+) -> Any:
+    """
+    Stream all categories and menu items as CSV or a JSON array, in the
+    format accepted by the import endpoint.
+    """
+    restaurant = db.query(models.Restaurant).filter(models.Restaurant.id == restaurant_id).first()
+    if not restaurant:
+        raise HTTPException(status_code=404, detail="Restaurant not found")
+    if restaurant.owner_id != current_user.id:
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+
+    if format == "json":
+        body, media_type = export_menu_json(restaurant_id), "application/json"
+    else:
+        body, media_type = export_menu_csv(restaurant_id), "text/csv"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="menu-{restaurant_id}.{format}"'},
+    )
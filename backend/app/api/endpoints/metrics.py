@@ -0,0 +1,43 @@
+from typing import Any, List
+from fastapi import APIRouter, Depends, Query
+
+from app import models, schemas
+from app.api import deps
+from app.services.push_dispatcher import push_dispatcher
+from app.socket_manager import emitter
+from app.utils.static_files import asset_stats
+
+router = APIRouter()
+
+@router.get("/static", response_model=List[schemas.StaticAssetStats])
+def read_static_asset_stats(
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: models.User = Depends(deps.get_current_active_owner),
+) -> Any:
+    """
+    Hit and byte counters per static asset since this worker started,
+    largest byte count first.
+    """
+    stats = sorted(asset_stats.snapshot(), key=lambda entry: entry["bytes"], reverse=True)
+    return stats[:limit]
+
+@router.get("/realtime", response_model=schemas.RealtimeEmitStats)
+def read_realtime_emit_stats(
+    current_user: models.User = Depends(deps.get_current_active_owner),
+) -> Any:
+    """
+    Socket.IO emit coalescing counters since this worker started: events
+    queued, frames sent, frames saved by batching and superseded updates, and
+    the delay the buffering window added.
+    """
+    return emitter.stats()
+
+@router.get("/push", response_model=schemas.PushDispatcherStats)
+def read_push_dispatcher_stats(
+    current_user: models.User = Depends(deps.get_current_active_owner),
+) -> Any:
+    """
+    Expo push dispatcher counters since this worker started, the number of
+    messages waiting and the circuit breaker state.
+    """
+    return push_dispatcher.stats()
@@ -1,105 +1,158 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import Any, List, Optional
+from datetime import datetime
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from sqlalchemy import literal, tuple_
+from sqlalchemy.orm import Session, selectinload
 
 from app import models, schemas
 from app.api import deps
 from app.db.session import get_db
-from app.socket_manager import notify_new_order, notify_order_update
-from app.services.notification_service import notify_user
-from fastapi import BackgroundTasks
+from app.services.notification_service import add_notifications, notify_users
+from app.services.outbox import queue_realtime
+from app.services.order_service import place_order, change_order_status, describe_status_conflict
+from app.services.idempotency import idempotency_store
+from app.services.archive_service import load_archived_orders, needs_archive
+from app.utils.pagination import encode_cursor, decode_cursor
 
 router = APIRouter()
 
+def paginate_orders(
+    db: Session,
+    query,
+    response: Response,
+    status: Optional[str],
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    cursor: Optional[str],
+    limit: int,
+    restaurant_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+) -> list:
+    """
+    Apply status / date filters and (created_at, id) keyset pagination to an
+    order query, newest first. Items and tables are eager-loaded so the page
+    costs a constant number of queries. When more rows exist, the cursor for
+    the next page is returned in the X-Next-Cursor header.
+
+    Archived orders of the restaurant / user are merged in whenever the
+    requested range reaches back to them, so history continues past archiving.
+    """
+    statuses = status.split(",") if status else None
+    position = None
+    if statuses:
+        query = query.filter(models.Order.status.in_(statuses))
+    if start_date:
+        query = query.filter(models.Order.created_at >= start_date)
+    if end_date:
+        query = query.filter(models.Order.created_at <= end_date)
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        created_at, order_id = position
+        query = query.filter(
+            tuple_(models.Order.created_at, models.Order.id) < tuple_(
+                literal(created_at, models.Order.created_at.type),
+                literal(order_id, models.Order.id.type)
+            )
+        )
+
+    orders = query.options(
+        selectinload(models.Order.items),
+        selectinload(models.Order.table)
+    ).order_by(
+        models.Order.created_at.desc(),
+        models.Order.id.desc()
+    ).limit(limit + 1).all()
+
+    if needs_archive(db, start_date, restaurant_id=restaurant_id, user_id=user_id):
+        orders += load_archived_orders(
+            db, limit + 1, restaurant_id=restaurant_id, user_id=user_id,
+            statuses=statuses, start_date=start_date, end_date=end_date, before=position
+        )
+        orders = sorted(orders, key=lambda order: (order.created_at, order.id), reverse=True)[:limit + 1]
+
+    if len(orders) > limit:
+        orders = orders[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(orders[-1].created_at, orders[-1].id)
+    return orders
+
 @router.post("/", response_model=schemas.Order)
 def create_order(
     *,
     db: Session = Depends(get_db),
     order_in: schemas.OrderCreate,
     current_user: models.User = Depends(deps.get_current_active_user),
-    background_tasks: BackgroundTasks = None,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
 ) -> Any:
     """
     Create new order (Customer)
+
+    Retries that repeat the same Idempotency-Key get the first response back.
     """
-    # Calculate total amount and verify items
-    total_amount = 0
-    order_items = []
-    
-    for item_in in order_in.items:
-        menu_item = db.query(models.MenuItem).filter(models.MenuItem.id == item_in.menu_item_id).first()
-        if not menu_item:
-            raise HTTPException(status_code=404, detail=f"Menu item {item_in.menu_item_id} not found")
-        if not menu_item.is_active:
-            raise HTTPException(status_code=400, detail=f"Menu item {menu_item.name} is not available")
-        
-        item_total = menu_item.price * item_in.quantity
-        total_amount += item_total
-        order_items.append({
-            "menu_item_id": item_in.menu_item_id,
-            "quantity": item_in.quantity,
-            "price": menu_item.price
-        })
-
-    order = models.Order(
-        restaurant_id=order_in.restaurant_id,
-        table_id=order_in.table_id,
-        user_id=current_user.id,
-        total_amount=total_amount,
-        status="pending"
-    )
-    db.add(order)
-    db.commit()
-    db.refresh(order)
+    with idempotency_store.claim("orders", current_user.id, idempotency_key, order_in) as claim:
+        if claim.replay is not None:
+            return claim.replay
 
-    for item_data in order_items:
-        order_item = models.OrderItem(
-            order_id=order.id,
-            **item_data
-        )
-        db.add(order_item)
-    
-    db.commit()
-    db.refresh(order)
-    
-    # Notify restaurant owner about new order
-    restaurant = db.query(models.Restaurant).filter(models.Restaurant.id == order.restaurant_id).first()
-    if restaurant:
-        notify_user(
+        order = place_order(db, order_in, current_user.id)
+
+        # Serialize before committing so nothing has to be reloaded
+        order_out = schemas.Order.model_validate(order)
+
+        # Notify restaurant owner about new order, in the same transaction as the order
+        notify_users(
             db=db,
-            user_id=restaurant.owner_id,
+            user_ids=[order.restaurant.owner_id],
             title="🍽️ New Order Received!",
-            body=f"Order #{order.id} - ${float(total_amount):.2f}",
-            data={"type": "order", "order_id": order.id}
+            body=f"Order #{order_out.id} - ${float(order_out.total_amount):.2f}",
+            data={"type": "order", "order_id": order_out.id}
+        )
+        # Send the order ID and status; clients fetch the rest
+        queue_realtime(
+            db, "new_order",
+            restaurant_id=order_out.restaurant_id,
+            order_data={"id": order_out.id, "status": order_out.status, "total_amount": float(order_out.total_amount)}
         )
-    
-    # Convert order to dict/schema for notification
-    # We can just send the ID and let the client fetch, or send the whole object.
-    # For simplicity, let's send the order ID and status.
-    if background_tasks:
-        background_tasks.add_task(notify_new_order, order.restaurant_id, {"id": order.id, "status": order.status, "total_amount": order.total_amount})
+        db.commit()
+        # Store the response as soon as the order exists so a retry never re-creates it
+        claim.save(order_out)
 
-    return order
+        return order_out
 
 @router.get("/my", response_model=List[schemas.Order])
 def read_my_orders(
+    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(deps.get_current_active_user),
+    status: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
 ) -> Any:
     """
-    Get current user's orders
+    Get current user's orders, newest first.
+    `status` accepts a comma-separated list; pass X-Next-Cursor back as `cursor` for the next page.
     """
-    orders = db.query(models.Order).filter(models.Order.user_id == current_user.id).all()
-    return orders
+    query = db.query(models.Order).filter(models.Order.user_id == current_user.id)
+    return paginate_orders(db, query, response, status, start_date, end_date, cursor, limit, user_id=current_user.id)
 
 @router.get("/restaurant/{restaurant_id}", response_model=List[schemas.Order])
 def read_restaurant_orders(
     restaurant_id: int,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(deps.get_current_active_owner),
+    status: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
 ) -> Any:
     """
-    Get orders for a restaurant (Owner only)
+    Get orders for a restaurant, newest first (Owner only).
+    `status` accepts a comma-separated list; pass X-Next-Cursor back as `cursor` for the next page.
     """
     restaurant = db.query(models.Restaurant).filter(models.Restaurant.id == restaurant_id).first()
     if not restaurant:
@@ -107,52 +160,150 @@ def read_restaurant_orders(
     if restaurant.owner_id != current_user.id:
         raise HTTPException(status_code=400, detail="Not enough permissions")
 
-    orders = db.query(models.Order).filter(models.Order.restaurant_id == restaurant_id).all()
-    return orders
+    query = db.query(models.Order).filter(models.Order.restaurant_id == restaurant_id)
+    return paginate_orders(db, query, response, status, start_date, end_date, cursor, limit, restaurant_id=restaurant_id)
+
+@router.get("/restaurant/{restaurant_id}/changes", response_model=schemas.OrderChanges)
+def read_restaurant_order_changes(
+    restaurant_id: int,
+    since: int = Query(0, ge=0),
+    limit: int = Query(200, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(deps.get_current_active_employee),
+) -> Any:
+    """
+    Get orders created or changed since a change sequence number (Kitchen display).
+    Start with since=0, then pass back the returned `seq`; keep going while `has_more` is true.
+    """
+    deps.verify_restaurant_staff(db, current_user, restaurant_id)
+
+    orders = db.query(models.Order).options(
+        selectinload(models.Order.items),
+        selectinload(models.Order.table)
+    ).filter(
+        models.Order.restaurant_id == restaurant_id,
+        models.Order.change_seq > since
+    ).order_by(models.Order.change_seq).limit(limit + 1).all()
+
+    has_more = len(orders) > limit
+    orders = orders[:limit]
+    return {
+        "seq": orders[-1].change_seq if orders else since,
+        "orders": orders,
+        "has_more": has_more
+    }
+
+def notify_status_changes(db: Session, order_rows, status: str) -> None:
+    """
+    Push an order status change to the customers who placed the orders,
+    with one insert for all of them.
+    """
+    title = "Order Update 🍽️"
+    body = f"Your order is now {status.title()}!"
+
+    if status == 'ready':
+        body = "Your food is ready! Please wait for it to be served."
+    elif status == 'completed':
+        body = "Order completed. Thank you for dining with us!"
+
+    add_notifications(db, [
+        {
+            "user_id": order_row.user_id,
+            "title": title,
+            "body": body,
+            "data": {"type": "order_update", "order_id": order_row.id, "status": status},
+        }
+        for order_row in order_rows if order_row.user_id
+    ])
+
+def queue_order_update(db: Session, restaurant_id: int, order_row) -> None:
+    """
+    Emit a compact 'order_update' to the customer, table and restaurant rooms
+    once the transaction commits, so clients can refetch only what changed.
+    """
+    queue_realtime(
+        db, "order_update",
+        restaurant_id=restaurant_id,
+        order_data={"id": order_row.id, "status": order_row.status, "version": order_row.version, "table_id": order_row.table_id},
+        customer_id=order_row.user_id,
+        table_id=order_row.table_id,
+    )
+
+def load_orders(db: Session, order_ids: List[int]) -> List[models.Order]:
+    """
+    Load orders with their items and tables, in the given id order.
+    """
+    orders = db.query(models.Order).options(
+        selectinload(models.Order.items),
+        selectinload(models.Order.table)
+    ).filter(models.Order.id.in_(order_ids)).populate_existing().all()
+    by_id = {order.id: order for order in orders}
+    return [by_id[order_id] for order_id in order_ids if order_id in by_id]
+
+@router.put("/status", response_model=schemas.OrderStatusBatchResult)
+def update_order_statuses(
+    update_in: schemas.OrderStatusBatchUpdate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(deps.get_current_active_employee),
+) -> Any:
+    """
+    Move several orders to the same status in one request (e.g. bump a whole table).
+    Orders that are not eligible or were changed concurrently come back in `conflicts`.
+    """
+    if not current_user.restaurant_id:
+        raise HTTPException(status_code=400, detail="Not authorized")
+
+    targets = [(ref.id, ref.version) for ref in update_in.orders]
+    changed = change_order_status(db, current_user.restaurant_id, update_in.status, targets)
+    notify_status_changes(db, changed, update_in.status)
+    for order_row in changed:
+        queue_order_update(db, current_user.restaurant_id, order_row)
+    db.commit()
+
+    changed_ids = {order_row.id for order_row in changed}
+    expected_versions = dict(targets)
+    conflict_ids = [order_id for order_id in expected_versions if order_id not in changed_ids]
+    conflicts = []
+    for order in load_orders(db, conflict_ids):
+        if order.restaurant_id == current_user.restaurant_id:
+            conflicts.append(describe_status_conflict(order, update_in.status, expected_versions[order.id]))
+    found_ids = {conflict["id"] for conflict in conflicts}
+    conflicts += [{"id": order_id, "message": "Order not found"} for order_id in conflict_ids if order_id not in found_ids]
+
+    return {
+        "updated": load_orders(db, [order_row.id for order_row in changed]),
+        "conflicts": conflicts
+    }
 
 @router.put("/{order_id}/status", response_model=schemas.Order)
 def update_order_status(
     order_id: int,
     status: str,
+    version: Optional[int] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(deps.get_current_active_employee),
 ) -> Any:
     """
-    Update order status
+    Update order status.
+    Pass the `version` you last saw to get a 409 instead of overwriting someone else's change.
     """
-    order = db.query(models.Order).filter(models.Order.id == order_id).first()
-    if not order:
-        raise HTTPException(status_code=404, detail="Order not found")
-    
-    # Verify employee belongs to the restaurant
-    if current_user.restaurant_id != order.restaurant_id:
+    if not current_user.restaurant_id:
         raise HTTPException(status_code=400, detail="Not authorized")
 
-    order.status = status
-    db.add(order)
-    db.commit()
-    db.refresh(order)
+    changed = change_order_status(db, current_user.restaurant_id, status, [(order_id, version)])
+    if not changed:
+        db.rollback()
+        order = db.query(models.Order).filter(models.Order.id == order_id).first()
+        if not order:
+            raise HTTPException(status_code=404, detail="Order not found")
+        # Verify employee belongs to the restaurant
+        if current_user.restaurant_id != order.restaurant_id:
+            raise HTTPException(status_code=400, detail="Not authorized")
+        raise HTTPException(status_code=409, detail=describe_status_conflict(order, status, version))
 
-    # Notify customer via WebSocket
-    # We can't easily use the global sio instance here without circular imports or setup
-    # But we can use the notification service for push notifications
-    
     # Send Push Notification to Customer
-    if order.user_id:
-        title = "Order Update 🍽️"
-        body = f"Your order is now {status.title()}!"
-        
-        if status == 'ready':
-            body = "Your food is ready! Please wait for it to be served."
-        elif status == 'completed':
-            body = "Order completed. Thank you for dining with us!"
-            
-        notify_user(
-            user_id=order.user_id,
-            title=title,
-            body=body,
-            data={"type": "order_update", "order_id": order.id, "status": status},
-            db=db
-        )
+    notify_status_changes(db, changed, status)
+    queue_order_update(db, current_user.restaurant_id, changed[0])
+    db.commit()
 
-    return order
+    return load_orders(db, [order_id])[0]
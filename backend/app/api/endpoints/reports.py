@@ -3,8 +3,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc, extract
 from app.api import deps
-from app.models.order import Order, OrderItem
 from app.models.menu import MenuItem
+from app.services.archive_service import needs_archive, order_source, order_item_source
 from datetime import datetime, timedelta
 
 router = APIRouter()
@@ -30,26 +30,30 @@ def get_sales_report(
     if period == "day":
         start_date = now - timedelta(days=1)
         # Group by hour
-        date_trunc = func.date_trunc('hour', Order.created_at)
+        trunc_unit = 'hour'
     elif period == "week":
         start_date = now - timedelta(weeks=1)
         # Group by day
-        date_trunc = func.date_trunc('day', Order.created_at)
+        trunc_unit = 'day'
     elif period == "month":
         start_date = now - timedelta(days=30)
         # Group by day
-        date_trunc = func.date_trunc('day', Order.created_at)
+        trunc_unit = 'day'
     else:
         raise HTTPException(status_code=400, detail="Invalid period")
 
+    # Only reach into the archive when the period goes back far enough
+    orders = order_source(needs_archive(db, start_date, restaurant_id=restaurant_id))
+    date_trunc = func.date_trunc(trunc_unit, orders.c.created_at)
+
     results = db.query(
         date_trunc.label('date'),
-        func.sum(Order.total_amount).label('total_sales'),
-        func.count(Order.id).label('order_count')
+        func.sum(orders.c.total_amount).label('total_sales'),
+        func.count(orders.c.id).label('order_count')
     ).filter(
-        Order.restaurant_id == restaurant_id,
-        Order.created_at >= start_date,
-        Order.status == 'completed' # Only count completed orders
+        orders.c.restaurant_id == restaurant_id,
+        orders.c.created_at >= start_date,
+        orders.c.status == 'completed' # Only count completed orders
     ).group_by(
         'date'
     ).order_by(
@@ -75,18 +79,22 @@ def get_popular_items(
     Get top selling items.
     """
     restaurant_id = current_user.restaurant_id
-    
+
+    # All-time report: include archived orders
+    orders = order_source(include_archive=True)
+    order_items = order_item_source(include_archive=True)
+
     results = db.query(
         MenuItem.name,
-        func.sum(OrderItem.quantity).label('total_quantity'),
-        func.sum(OrderItem.quantity * OrderItem.price).label('total_revenue')
+        func.sum(order_items.c.quantity).label('total_quantity'),
+        func.sum(order_items.c.quantity * order_items.c.price).label('total_revenue')
     ).join(
-        OrderItem, MenuItem.id == OrderItem.menu_item_id
+        order_items, MenuItem.id == order_items.c.menu_item_id
     ).join(
-        Order, OrderItem.order_id == Order.id
+        orders, order_items.c.order_id == orders.c.id
     ).filter(
-        Order.restaurant_id == restaurant_id,
-        Order.status == 'completed'
+        orders.c.restaurant_id == restaurant_id,
+        orders.c.status == 'completed'
     ).group_by(
         MenuItem.id, MenuItem.name
     ).order_by(
@@ -114,13 +122,14 @@ def get_peak_hours(
     
     # Look back 30 days for a good average
     start_date = datetime.now() - timedelta(days=30)
+    orders = order_source(needs_archive(db, start_date, restaurant_id=restaurant_id))
 
     results = db.query(
-        extract('hour', Order.created_at).label('hour'),
-        func.count(Order.id).label('order_count')
+        extract('hour', orders.c.created_at).label('hour'),
+        func.count(orders.c.id).label('order_count')
     ).filter(
-        Order.restaurant_id == restaurant_id,
-        Order.created_at >= start_date
+        orders.c.restaurant_id == restaurant_id,
+        orders.c.created_at >= start_date
     ).group_by(
         'hour'
     ).order_by(
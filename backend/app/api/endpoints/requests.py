@@ -34,22 +34,23 @@ def create_request(
         status=RequestStatus.PENDING
     )
     db.add(request)
-    db.commit()
-    db.refresh(request)
+    db.flush()
     
     # Notify owner
     restaurant = db.query(models.Restaurant).filter(models.Restaurant.id == current_user.restaurant_id).first()
     if restaurant:
         date_str = request_in.start_time.strftime('%Y-%m-%d')
         request_type = "Work" if request_in.type == RequestType.WORK else "Leave"
-        notification_service.notify_user(
+        notification_service.notify_users(
             db=db,
-            user_id=restaurant.owner_id,
+            user_ids=[restaurant.owner_id],
             title=f"New Request from {current_user.name}",
             body=f"{request_type} request for {date_str}",
             data={"type": "request", "request_id": request.id}
         )
-    
+
+    db.commit()
+    db.refresh(request)
     return request
 
 @router.get("/", response_model=List[schemas.RequestResponse])
@@ -97,22 +98,22 @@ def update_request_status(
     old_status = request.status
     request.status = status_in.status
     db.add(request)
-    db.commit()
-    db.refresh(request)
     
     # Notify employee if status changed
     if old_status != status_in.status and status_in.status in [RequestStatus.APPROVED, RequestStatus.REJECTED]:
         date_str = request.start_time.strftime("%Y-%m-%d")
         request_type = "work" if request.type == RequestType.WORK else "leave"
         status_text = "approved" if status_in.status == RequestStatus.APPROVED else "declined"
-        notification_service.notify_user(
+        notification_service.notify_users(
             db=db,
-            user_id=request.employee_id,
+            user_ids=[request.employee_id],
             title=f"Request {status_text.title()}",
             body=f"Your {request_type} request for {date_str} was {status_text}",
             data={"type": "request", "request_id": request.id, "status": status_text}
         )
-    
+
+    db.commit()
+    db.refresh(request)
     return request
 
 @router.get("/schedule", response_model=List[schemas.RequestResponse])
@@ -1,14 +1,74 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import Any, List, Optional, Set
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import delete, insert, update
+from sqlalchemy.orm import Session, raiseload, selectinload
 
 from app import models, schemas
 from app.api import deps
 from app.db.session import get_db
-from app.utils.qr import generate_qr_code
+from app.utils.qr import QR_MEDIA_TYPES
+from app.services.menu_cache import bump_menu_version, etag_matches
+from app.services.qr_service import QR_VERSION, build_qr_sheet, get_table_qr
 
 router = APIRouter()
 
+# Nested collections a restaurant response can include
+RESTAURANT_INCLUDES = {"tables", "categories", "categories.items"}
+RESTAURANT_FIELDS = ["id", "owner_id", "name", "address", "phone", "enable_time_clock"]
+
+def parse_includes(include: Optional[str]) -> Set[str]:
+    """
+    Parse an include= parameter such as "tables,categories.items". Without the
+    parameter everything is included (the original response shape); an empty
+    value returns the restaurant header only.
+    """
+    if include is None:
+        return set(RESTAURANT_INCLUDES)
+    includes = {part.strip() for part in include.split(",") if part.strip()}
+    unknown = includes - RESTAURANT_INCLUDES
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown include: {', '.join(sorted(unknown))}")
+    if "categories.items" in includes:
+        includes.add("categories")
+    return includes
+
+def restaurant_load_options(includes: Set[str]) -> list:
+    """
+    One selectinload per requested collection; anything not requested raises
+    instead of lazy loading, so a response can never fall back to N+1 queries.
+    """
+    options = [
+        selectinload(models.Restaurant.tables) if "tables" in includes
+        else raiseload(models.Restaurant.tables)
+    ]
+    if "categories.items" in includes:
+        options.append(selectinload(models.Restaurant.categories).selectinload(models.Category.items))
+    elif "categories" in includes:
+        options.append(selectinload(models.Restaurant.categories).raiseload(models.Category.items))
+    else:
+        options.append(raiseload(models.Restaurant.categories))
+    return options
+
+def serialize_restaurant(restaurant: models.Restaurant, includes: Set[str]) -> schemas.Restaurant:
+    """
+    Build a Restaurant response holding only the requested collections; used
+    with response_model_exclude_unset so the rest are left out of the JSON.
+    """
+    data = {field: getattr(restaurant, field) for field in RESTAURANT_FIELDS}
+    if "tables" in includes:
+        data["tables"] = restaurant.tables
+    if "categories" in includes:
+        data["categories"] = [
+            {
+                "id": category.id,
+                "restaurant_id": category.restaurant_id,
+                "name": category.name,
+                **({"items": category.items} if "categories.items" in includes else {}),
+            }
+            for category in restaurant.categories
+        ]
+    return schemas.Restaurant.model_validate(data, from_attributes=True)
+
 @router.post("/", response_model=schemas.Restaurant)
 def create_restaurant(
     *,
@@ -33,29 +93,38 @@ def create_restaurant(
     db.refresh(restaurant)
     return restaurant
 
-@router.get("/me", response_model=List[schemas.Restaurant])
+@router.get("/me", response_model=List[schemas.Restaurant], response_model_exclude_unset=True)
 def read_my_restaurants(
+    include: Optional[str] = Query(None, description="Comma-separated: tables, categories, categories.items"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(deps.get_current_active_owner),
 ) -> Any:
     """
     Get current user's restaurants
     """
-    restaurants = db.query(models.Restaurant).filter(models.Restaurant.owner_id == current_user.id).all()
-    return restaurants
+    includes = parse_includes(include)
+    restaurants = db.query(models.Restaurant).options(
+        *restaurant_load_options(includes)
+    ).filter(models.Restaurant.owner_id == current_user.id).all()
+    return [serialize_restaurant(restaurant, includes) for restaurant in restaurants]
 
-@router.get("/{restaurant_id}", response_model=schemas.Restaurant)
+@router.get("/{restaurant_id}", response_model=schemas.Restaurant, response_model_exclude_unset=True)
 def read_restaurant(
     restaurant_id: int,
+    include: Optional[str] = Query(None, description="Comma-separated: tables, categories, categories.items"),
     db: Session = Depends(get_db),
 ) -> Any:
     """
-    Get restaurant by ID (Public)
+    Get restaurant by ID (Public). `include=` picks the nested collections to
+    return, e.g. include=tables or include= for the header only.
     """
-    restaurant = db.query(models.Restaurant).filter(models.Restaurant.id == restaurant_id).first()
+    includes = parse_includes(include)
+    restaurant = db.query(models.Restaurant).options(
+        *restaurant_load_options(includes)
+    ).filter(models.Restaurant.id == restaurant_id).first()
     if not restaurant:
         raise HTTPException(status_code=404, detail="Restaurant not found")
-    return restaurant
+    return serialize_restaurant(restaurant, includes)
 
 @router.put("/{restaurant_id}", response_model=schemas.Restaurant)
 def update_restaurant(
@@ -78,6 +147,8 @@ def update_restaurant(
         setattr(restaurant, field, value)
 
     db.add(restaurant)
+    # The menu snapshot carries the restaurant header
+    bump_menu_version(db, restaurant.id)
     db.commit()
     db.refresh(restaurant)
     return restaurant
@@ -90,7 +161,7 @@ def create_table(
     current_user: models.User = Depends(deps.get_current_active_owner),
 ) -> Any:
     """
-    Create a table and generate QR code
+    Create a table (its QR code is served by GET .../tables/{table_id}/qr)
     """
     restaurant = db.query(models.Restaurant).filter(models.Restaurant.id == restaurant_id).first()
     if not restaurant:
@@ -105,19 +176,58 @@ def create_table(
     db.add(table)
     db.commit()
     db.refresh(table)
-
-    # Generate QR Code
-    # Format: https://<domain>/scan?restaurant_id=1&table_id=1
-    qr_data = f"restaurant_id={restaurant_id}&table_id={table.id}"
-    qr_code = generate_qr_code(qr_data)
-    
-    table.qr_code_url = qr_code # Storing base64 for simplicity, ideally upload to S3
-    db.add(table)
-    db.commit()
-    db.refresh(table)
-    
     return table
 
+@router.get("/{restaurant_id}/tables/qr-sheet")
+def read_tables_qr_sheet(
+    restaurant_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(deps.get_current_active_owner),
+) -> Any:
+    """
+    Printable PDF with the QR code of every table, labelled by table number
+    """
+    restaurant = db.query(models.Restaurant).filter(models.Restaurant.id == restaurant_id).first()
+    if not restaurant:
+        raise HTTPException(status_code=404, detail="Restaurant not found")
+    if restaurant.owner_id != current_user.id:
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+
+    tables = db.query(models.Table.id, models.Table.table_number).filter(
+        models.Table.restaurant_id == restaurant_id
+    ).order_by(models.Table.id).all()
+    pdf = build_qr_sheet(restaurant_id, restaurant.name or "", [(table.id, table.table_number) for table in tables])
+    return Response(
+        content=pdf,
+        media_type="application/pdf",
+        headers={"Content-Disposition": f'attachment; filename="tables-qr-{restaurant_id}.pdf"'},
+    )
+
+@router.get("/{restaurant_id}/tables/{table_id}/qr")
+def read_table_qr(
+    restaurant_id: int,
+    table_id: int,
+    request: Request,
+    format: str = Query("png", pattern="^(png|svg)$"),
+    db: Session = Depends(get_db),
+) -> Any:
+    """
+    QR code a customer scans to order from this table (Public, cacheable)
+    """
+    exists = db.query(models.Table.id).filter(
+        models.Table.id == table_id, models.Table.restaurant_id == restaurant_id
+    ).first()
+    if not exists:
+        raise HTTPException(status_code=404, detail="Table not found")
+
+    headers = {
+        "ETag": f'"qr-v{QR_VERSION}-{restaurant_id}-{table_id}-{format}"',
+        "Cache-Control": "public, max-age=86400",
+    }
+    if etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=get_table_qr(restaurant_id, table_id, format), media_type=QR_MEDIA_TYPES[format], headers=headers)
+
 @router.delete("/{restaurant_id}/tables/{table_id}", response_model=schemas.Table)
 def delete_table(
     restaurant_id: int,
@@ -171,3 +281,72 @@ def update_table(
     db.commit()
     db.refresh(table)
     return table
+
+@router.put("/{restaurant_id}/floor-plan", response_model=List[schemas.Table])
+def update_floor_plan(
+    restaurant_id: int,
+    floor_plan: schemas.FloorPlanUpdate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(deps.get_current_active_owner),
+) -> Any:
+    """
+    Save a whole floor-plan edit at once: create tables (no id), move / reshape
+    existing ones and delete others, in a single transaction. Returns the
+    resulting floor.
+    """
+    restaurant = db.query(models.Restaurant).filter(models.Restaurant.id == restaurant_id).first()
+    if not restaurant:
+        raise HTTPException(status_code=404, detail="Restaurant not found")
+    if restaurant.owner_id != current_user.id:
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+
+    existing = {
+        table.id: table
+        for table in db.query(models.Table).filter(models.Table.restaurant_id == restaurant_id).all()
+    }
+
+    inserts = []
+    updates = []
+    kept_ids = set()
+    for table_in in floor_plan.tables:
+        values = table_in.dict(exclude_unset=True, exclude={"id"})
+        if table_in.id is None:
+            if not values.get("table_number"):
+                raise HTTPException(status_code=400, detail="New tables need a table_number")
+            inserts.append({"restaurant_id": restaurant_id, **values})
+            continue
+
+        table = existing.get(table_in.id)
+        if not table:
+            raise HTTPException(status_code=404, detail=f"Table {table_in.id} not found")
+        kept_ids.add(table.id)
+        # Only send columns that actually moved
+        changed = {field: value for field, value in values.items() if getattr(table, field) != value}
+        if changed:
+            updates.append({"id": table.id, **changed})
+
+    delete_ids = set(floor_plan.delete)
+    missing = delete_ids - existing.keys()
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Table {min(missing)} not found")
+    if floor_plan.replace:
+        delete_ids |= existing.keys() - kept_ids
+    if delete_ids & kept_ids:
+        raise HTTPException(status_code=400, detail="A table cannot be both updated and deleted")
+
+    # One executemany per statement kind; the commit expires the loaded rows
+    if updates:
+        db.execute(update(models.Table), updates)
+    if inserts:
+        db.execute(insert(models.Table), inserts)
+    if delete_ids:
+        db.execute(
+            delete(models.Table)
+            .where(models.Table.restaurant_id == restaurant_id, models.Table.id.in_(delete_ids))
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+
+    return db.query(models.Table).filter(
+        models.Table.restaurant_id == restaurant_id
+    ).order_by(models.Table.id).all()
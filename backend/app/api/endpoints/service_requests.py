@@ -1,12 +1,15 @@
 from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException
 from sqlalchemy.orm import Session
 from datetime import datetime
 
 from app import models, schemas
 from app.api import deps
 from app.db.session import get_db
-from app.services.notification_service import notify_user
+from app.services.notification_service import notify_users
+from app.services.idempotency import idempotency_store
+from app.services.outbox import queue_realtime
+from app.services.presence import presence
 
 router = APIRouter()
 
@@ -16,56 +19,67 @@ def create_service_request(
     db: Session = Depends(get_db),
     request_in: schemas.ServiceRequestCreate,
     current_user: Optional[models.User] = Depends(deps.get_current_user_optional),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
 ) -> Any:
     """
     Create a service request (Call Waiter / Bill)
+
+    Retries that repeat the same Idempotency-Key get the first response back.
     """
-    # Verify table exists
-    table = db.query(models.Table).filter(models.Table.id == request_in.table_id).first()
-    if not table:
-        raise HTTPException(status_code=404, detail="Table not found")
-    
-    service_request = models.ServiceRequest(
-        restaurant_id=table.restaurant_id,
-        table_id=table.id,
-        user_id=current_user.id if current_user else None,
-        type=request_in.type,
-        note=request_in.note,
-        status="pending"
-    )
+    # Guests have no account, so their keys are scoped to the table they call from
+    owner = current_user.id if current_user else f"table-{request_in.table_id}"
+    with idempotency_store.claim("service-requests", owner, idempotency_key, request_in) as claim:
+        if claim.replay is not None:
+            return claim.replay
+
+        # Verify table exists
+        table = db.query(models.Table).filter(models.Table.id == request_in.table_id).first()
+        if not table:
+            raise HTTPException(status_code=404, detail="Table not found")
     
-    db.add(service_request)
-    db.commit()
-    db.refresh(service_request)
+        service_request = models.ServiceRequest(
+            restaurant_id=table.restaurant_id,
+            table_id=table.id,
+            user_id=current_user.id if current_user else None,
+            type=request_in.type,
+            note=request_in.note,
+            status="pending"
+        )
     
-    # Notify restaurant owner and employees
-    restaurant = db.query(models.Restaurant).filter(models.Restaurant.id == table.restaurant_id).first()
-    if restaurant:
-        # Notify Owner
-        notify_user(
-            user_id=restaurant.owner_id,
-            title="🛎️ New Service Request",
-            body=f"Table {table.table_number}: {request_in.type.title()}",
-            data={"type": "service_request", "id": service_request.id},
-            db=db
+        db.add(service_request)
+        db.flush()
+
+        queue_realtime(
+            db, "service_request",
+            restaurant_id=service_request.restaurant_id,
+            request_data={
+                "id": service_request.id,
+                "table_id": service_request.table_id,
+                "type": service_request.type,
+                "status": service_request.status,
+            }
         )
-        
-        # Notify Employees (TODO: Filter by active/clocked-in employees)
-        employees = db.query(models.User).filter(
-            models.User.restaurant_id == restaurant.id,
-            models.User.role == "employee"
-        ).all()
-        
-        for emp in employees:
-            notify_user(
-                user_id=emp.id,
+    
+        # Notify the owner and the employees on shift; anyone connected right now
+        # gets the realtime event above, so they get no push
+        owner_id = db.query(models.Restaurant.owner_id).filter(models.Restaurant.id == table.restaurant_id).scalar()
+        if owner_id:
+            recipients = [owner_id] + sorted(presence.on_shift(db, table.restaurant_id) - {owner_id})
+            notify_users(
+                db=db,
+                user_ids=recipients,
                 title="🛎️ New Service Request",
                 body=f"Table {table.table_number}: {request_in.type.title()}",
                 data={"type": "service_request", "id": service_request.id},
-                db=db
+                skip_push={user_id for user_id in recipients if presence.is_online(user_id)}
             )
+
+        db.commit()
+        db.refresh(service_request)
+        # Store the response as soon as the request exists so a retry never re-creates it
+        claim.save(schemas.ServiceRequestResponse.model_validate(service_request))
     
-    return service_request
+        return service_request
 
 @router.get("/restaurant/{restaurant_id}", response_model=List[schemas.ServiceRequestResponse])
 def get_restaurant_requests(
@@ -8,6 +8,7 @@ from decimal import Decimal
 from app import models, schemas
 from app.api import deps
 from app.db.session import get_db
+from app.services.presence import presence
 
 router = APIRouter()
 
@@ -51,6 +52,7 @@ def clock_in(
     db.add(time_entry)
     db.commit()
     db.refresh(time_entry)
+    presence.clock_in(time_entry.restaurant_id, current_user.id)
     
     return time_entry
 
@@ -92,6 +94,7 @@ def clock_out(
     db.add(time_entry)
     db.commit()
     db.refresh(time_entry)
+    presence.clock_out(time_entry.restaurant_id, current_user.id)
     
     return time_entry
 
@@ -6,6 +6,7 @@ from sqlalchemy import func
 from app import models, schemas
 from app.api import deps
 from app.core import security
+from app.services.archive_service import order_source
 
 router = APIRouter()
 
@@ -69,17 +70,20 @@ def get_user_stats(
     """
     Get user statistics (orders, spending, favorites).
     """
+    # Lifetime stats, so include archived orders
+    orders = order_source(include_archive=True)
+
     # Get total orders
-    total_orders = db.query(models.Order).filter(
-        models.Order.user_id == current_user.id
-    ).count()
+    total_orders = db.query(func.count(orders.c.id)).filter(
+        orders.c.user_id == current_user.id
+    ).scalar()
     
     # Get total spent
     total_spent_result = db.query(
-        func.sum(models.Order.total_amount)
+        func.sum(orders.c.total_amount)
     ).filter(
-        models.Order.user_id == current_user.id,
-        models.Order.status.in_(["completed", "ready", "preparing"])
+        orders.c.user_id == current_user.id,
+        orders.c.status.in_(["completed", "ready", "preparing"])
     ).scalar()
     
     total_spent = float(total_spent_result) if total_spent_result else 0.0
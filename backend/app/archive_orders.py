@@ -0,0 +1,39 @@
+"""
+Archival job: moves completed / cancelled orders older than
+ORDER_ARCHIVE_AFTER_DAYS into orders_archive / order_items_archive.
+
+Run it periodically (e.g. nightly from cron):
+    python -m app.archive_orders [--days 30] [--batch-size 500]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.db.base import Base
+from app.db.session import SessionLocal, engine
+from app.models import OrderArchive, OrderItemArchive
+from app.services.archive_service import archive_orders
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive old completed / cancelled orders")
+    parser.add_argument("--days", type=int, default=settings.ORDER_ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.ORDER_ARCHIVE_BATCH_SIZE)
+    args = parser.parse_args()
+
+    # Make sure the archive tables exist
+    Base.metadata.create_all(bind=engine, tables=[OrderArchive.__table__, OrderItemArchive.__table__])
+
+    db = SessionLocal()
+    try:
+        archived = archive_orders(db, older_than_days=args.days, batch_size=args.batch_size)
+    finally:
+        db.close()
+
+    print(f"✅ Archived {archived} orders older than {args.days} days")
+
+if __name__ == "__main__":
+    main()
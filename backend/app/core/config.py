@@ -10,6 +10,70 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./sql_app.db"
 
+    # Idempotency-Key replay store (POST /orders, POST /service-requests)
+    IDEMPOTENCY_TTL_SECONDS: int = 60 * 60 * 24 # 24 hours
+    IDEMPOTENCY_MAX_KEYS: int = 10000
+
+    # Order archival (see app/archive_orders.py)
+    ORDER_ARCHIVE_AFTER_DAYS: int = 30
+    ORDER_ARCHIVE_BATCH_SIZE: int = 500
+
+    # Public menu caching
+    MENU_CACHE_MAX_AGE: int = 60 # Cache-Control max-age for public menu responses
+    MENU_VERSION_RECHECK_SECONDS: int = 5 # How long a worker trusts its cached menu version
+    MENU_CACHE_MAX_ENTRIES: int = 1000
+    MENU_SNAPSHOT_DIR: str = "app/cache/menu_snapshots"
+    MENU_SNAPSHOT_WAIT_SECONDS: float = 2 # How long a request waits for a rebuild before serving the previous snapshot
+
+    # Bulk menu import (POST /menu/{restaurant_id}/import)
+    MENU_IMPORT_CHUNK_SIZE: int = 500 # Rows validated and written per transaction
+    MENU_IMPORT_MAX_ERRORS: int = 100 # Row errors listed in the import result
+
+    # Menu image uploads
+    IMAGE_UPLOAD_MAX_BYTES: int = 10 * 1024 * 1024 # 10 MB
+    IMAGE_UPLOAD_DIR: str = "app/static/images"
+    IMAGE_URL_PREFIX: str = "/static/images"
+
+    # Worker processes for CPU-bound rendering (image variants, QR codes)
+    WORKER_PROCESSES: int = 2
+
+    # Table QR codes
+    QR_CACHE_DIR: str = "app/cache/qr"
+    QR_CACHE_MAX_ENTRIES: int = 512 # Rendered codes kept in memory per worker
+
+    # Socket.IO fan-out between workers: empty for a single in-process worker,
+    # redis://host:6379/0 (needs the redis package) or postgresql://... for LISTEN/NOTIFY
+    SOCKETIO_MANAGER_URL: str = ""
+    SOCKETIO_CHANNEL: str = "socketio"
+    SOCKETIO_AUTH_CACHE_SECONDS: int = 60 # How long a worker trusts a verified token's user and role
+    SOCKETIO_AUTH_CACHE_MAX_ENTRIES: int = 10000
+    SOCKETIO_EMIT_WINDOW_MS: int = 50 # Emits to a room within this window go out as one frame; 0 sends immediately
+    SOCKETIO_HISTORY_MAX_EVENTS: int = 200 # Frames kept per room for replay after a reconnect
+    SOCKETIO_HISTORY_MAX_ROOMS: int = 10000
+
+    # Staff presence: how long a worker trusts its cached list of clocked-in employees
+    PRESENCE_RECHECK_SECONDS: int = 30
+
+    # Expo push notifications, sent in batches from a background thread
+    EXPO_PUSH_URL: str = "https://exp.host/--/api/v2/push/send"
+    PUSH_BATCH_SIZE: int = 100 # Messages per Expo request (Expo's maximum)
+    PUSH_QUEUE_SIZE: int = 10000 # Messages waiting to be sent before new ones are dropped
+    PUSH_MAX_RETRIES: int = 5
+    PUSH_BACKOFF_SECONDS: float = 0.5 # First retry delay, doubled on every retry
+    PUSH_TIMEOUT_SECONDS: float = 10
+    PUSH_BREAKER_THRESHOLD: int = 5 # Consecutive failed requests before pausing
+    PUSH_BREAKER_RESET_SECONDS: int = 30
+
+    # Transactional outbox for push notifications and realtime events
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_LEASE_SECONDS: int = 300 # A claimed event is retried if not delivered within this time
+    OUTBOX_POLL_SECONDS: float = 5 # Also look for events committed by other processes this often
+    OUTBOX_MAX_ATTEMPTS: int = 10
+
+    # Server-Sent Events streams (GET /events/...)
+    SSE_QUEUE_SIZE: int = 100 # Events buffered per stream before a slow client is disconnected to resume
+    SSE_HEARTBEAT_SECONDS: int = 15
+
     class Config:
         env_file = ".env"
 
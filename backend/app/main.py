@@ -1,17 +1,29 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.core.config import settings
 from app.db.session import engine
 from app.db.base import Base
 from app.models import * # Import all models to ensure they are registered
 from app.socket_manager import sio
+from app.services.menu_search import ensure_search_index
+from app.services.outbox import outbox_worker
 import socketio
 
 # Create tables
 Base.metadata.create_all(bind=engine)
+ensure_search_index(engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Deliver queued notifications and realtime events from this worker
+    outbox_worker.start()
+    yield
+    await outbox_worker.stop()
 
 fastapi_app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 from fastapi.middleware.cors import CORSMiddleware
@@ -22,6 +34,7 @@ fastapi_app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 @fastapi_app.get("/")
@@ -32,14 +45,14 @@ from app.api.api import api_router
 
 fastapi_app.include_router(api_router, prefix=settings.API_V1_STR)
 
-from fastapi.staticfiles import StaticFiles
+from app.utils.static_files import ImmutableStaticFiles
 import os
 
 # Ensure static directory exists
 os.makedirs("app/static/images", exist_ok=True)
 
-# Mount static files
-fastapi_app.mount("/static", StaticFiles(directory="app/static"), name="static")
+# Mount static files (content-hashed names are served as immutable)
+fastapi_app.mount("/static", ImmutableStaticFiles(directory="app/static"), name="static")
 
 # Wrap FastAPI with Socket.IO
 app = socketio.ASGIApp(sio, fastapi_app)
@@ -0,0 +1,30 @@
+"""
+Database migration script to add menu_items.image_variants (resized menu image URLs)
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, text
+from app.core.config import settings
+
+def migrate():
+    """Add image_variants column to menu_items table"""
+    engine = create_engine(str(settings.DATABASE_URL))
+
+    print("Adding image_variants column to menu_items table...")
+
+    with engine.begin() as conn:
+        try:
+            conn.execute(text("ALTER TABLE menu_items ADD COLUMN image_variants JSON"))
+            print("✅ Added image_variants column")
+        except Exception as e:
+            if "duplicate column" in str(e).lower() or "already exists" in str(e).lower():
+                print("ℹ️ Column image_variants already exists")
+            else:
+                print(f"❌ Error adding column: {e}")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,30 @@
+"""
+Database migration script to add restaurants.menu_version (menu cache validator)
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, text
+from app.core.config import settings
+
+def migrate():
+    """Add menu_version column to restaurants table"""
+    engine = create_engine(str(settings.DATABASE_URL))
+
+    print("Adding menu_version column to restaurants table...")
+
+    with engine.begin() as conn:
+        try:
+            conn.execute(text("ALTER TABLE restaurants ADD COLUMN menu_version INTEGER NOT NULL DEFAULT 0"))
+            print("✅ Added menu_version column")
+        except Exception as e:
+            if "duplicate column" in str(e).lower() or "already exists" in str(e).lower():
+                print("ℹ️ Column menu_version already exists")
+            else:
+                print(f"❌ Error adding column: {e}")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,49 @@
+"""
+Database migration script to add the order change feed columns:
+restaurants.order_seq and orders.change_seq
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, text
+from app.core.config import settings
+from app.db.base import Base
+from app.models import Order
+
+def migrate():
+    """Add order_seq / change_seq columns and backfill them"""
+    engine = create_engine(str(settings.DATABASE_URL))
+
+    with engine.begin() as conn:
+        for statement in [
+            "ALTER TABLE restaurants ADD COLUMN order_seq INTEGER NOT NULL DEFAULT 0",
+            "ALTER TABLE orders ADD COLUMN change_seq INTEGER",
+        ]:
+            try:
+                conn.execute(text(statement))
+                print(f"✓ {statement}")
+            except Exception as e:
+                if "duplicate column" in str(e).lower() or "already exists" in str(e).lower():
+                    print(f"ℹ️ Column already exists: {statement}")
+                else:
+                    raise
+
+        # Order ids already increase with time, so they make a valid starting sequence
+        print("Backfilling change sequence numbers...")
+        conn.execute(text("UPDATE orders SET change_seq = id WHERE change_seq IS NULL"))
+        conn.execute(text("""
+            UPDATE restaurants SET order_seq = COALESCE(
+                (SELECT MAX(change_seq) FROM orders WHERE orders.restaurant_id = restaurants.id), 0
+            )
+        """))
+
+    indexes = {index.name: index for index in Base.metadata.tables['orders'].indexes}
+    indexes["ix_orders_restaurant_change_seq"].create(engine, checkfirst=True)
+
+    print("✅ Migration completed successfully!")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,36 @@
+"""
+Database migration script to add the composite indexes used by the
+paginated order feeds
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine
+from app.core.config import settings
+from app.db.base import Base
+from app.models import Order
+
+INDEXES = [
+    "ix_orders_restaurant_created",
+    "ix_orders_restaurant_status_created",
+    "ix_orders_user_created",
+]
+
+def migrate():
+    """Add composite indexes on orders"""
+    engine = create_engine(str(settings.DATABASE_URL))
+
+    print("Creating order feed indexes...")
+
+    indexes = {index.name: index for index in Base.metadata.tables['orders'].indexes}
+    for name in INDEXES:
+        indexes[name].create(engine, checkfirst=True)
+        print(f"   - {name}")
+
+    print("✅ Migration completed successfully!")
+
+if __name__ == "__main__":
+    migrate()
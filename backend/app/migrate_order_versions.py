@@ -0,0 +1,31 @@
+"""
+Database migration script to add orders.version (optimistic concurrency
+for status changes)
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, text
+from app.core.config import settings
+
+def migrate():
+    """Add version column to orders table"""
+    engine = create_engine(str(settings.DATABASE_URL))
+
+    print("Adding version column to orders table...")
+
+    with engine.begin() as conn:
+        try:
+            conn.execute(text("ALTER TABLE orders ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
+            print("✅ Added version column")
+        except Exception as e:
+            if "duplicate column" in str(e).lower() or "already exists" in str(e).lower():
+                print("ℹ️ Column version already exists")
+            else:
+                print(f"❌ Error adding column: {e}")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,28 @@
+"""
+Database migration script to add the outbox_events table
+(notifications and realtime events delivered after commit)
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine
+from app.core.config import settings
+from app.models import OutboxEvent
+
+def migrate():
+    """Create outbox_events and its index"""
+    engine = create_engine(str(settings.DATABASE_URL))
+
+    OutboxEvent.__table__.create(engine, checkfirst=True)
+    print("✓ outbox_events table")
+    for index in OutboxEvent.__table__.indexes:
+        index.create(engine, checkfirst=True)
+        print(f"✓ {index.name}")
+
+    print("✅ Migration completed successfully!")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,34 @@
+"""
+Database migration script to drop tables.qr_code_url (QR codes are now rendered on demand)
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, inspect, text
+from app.core.config import settings
+
+def migrate():
+    """Remove the stored QR data URIs from the tables table"""
+    engine = create_engine(str(settings.DATABASE_URL))
+
+    print("Dropping qr_code_url column from tables table...")
+
+    with engine.begin() as conn:
+        columns = [column["name"] for column in inspect(conn).get_columns("tables")]
+        if "qr_code_url" not in columns:
+            print("ℹ️ Column qr_code_url already dropped")
+            return
+        try:
+            conn.execute(text("ALTER TABLE tables DROP COLUMN qr_code_url"))
+            print("✅ Dropped qr_code_url column")
+        except Exception as e:
+            # SQLite before 3.35 cannot drop columns: at least free the space
+            print(f"⚠️ Could not drop column ({e}), clearing it instead")
+            conn.execute(text("UPDATE tables SET qr_code_url = NULL"))
+            print("✅ Cleared stored QR codes")
+
+if __name__ == "__main__":
+    migrate()
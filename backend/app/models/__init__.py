@@ -1,8 +1,9 @@
 from .user import User
 from .restaurant import Restaurant, Table
 from .menu import Category, MenuItem
-from .order import Order, OrderItem
+from .order import Order, OrderItem, OrderStatus, ORDER_STATUS_TRANSITIONS, OrderArchive, OrderItemArchive
 from .request import EmployeeRequest
 from .notification import Notification
 from .time_entry import TimeEntry
 from .service_request import ServiceRequest
+from .outbox import OutboxEvent
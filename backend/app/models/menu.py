@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Numeric, Boolean, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, Numeric, Boolean, Text, JSON
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -22,6 +22,7 @@ class MenuItem(Base):
     description = Column(Text)
     price = Column(Numeric(10, 2))
     image_url = Column(String, nullable=True)
+    image_variants = Column(JSON, nullable=True) # {variant: {webp, jpeg, width, height}}
     is_active = Column(Boolean, default=True)
     is_available = Column(Boolean, default=True)
 
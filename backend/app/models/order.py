@@ -1,18 +1,53 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Numeric, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Numeric, DateTime, Index
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base import Base
+import enum
+
+# SQLite's CURRENT_TIMESTAMP has no fractional seconds; bind datetimes in the
+# same format so created_at comparisons (keyset pagination) match stored rows.
+Timestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"),
+    "sqlite"
+)
+
+class OrderStatus(str, enum.Enum):
+    PENDING = "pending"
+    PREPARING = "preparing"
+    READY = "ready"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+
+# Status -> statuses it may move to next
+ORDER_STATUS_TRANSITIONS = {
+    OrderStatus.PENDING: {OrderStatus.PREPARING, OrderStatus.CANCELLED},
+    OrderStatus.PREPARING: {OrderStatus.READY, OrderStatus.CANCELLED},
+    OrderStatus.READY: {OrderStatus.COMPLETED, OrderStatus.CANCELLED},
+    OrderStatus.COMPLETED: set(),
+    OrderStatus.CANCELLED: set(),
+}
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # Keyset pagination on (created_at, id), optionally filtered by status
+        Index("ix_orders_restaurant_created", "restaurant_id", "created_at", "id"),
+        Index("ix_orders_restaurant_status_created", "restaurant_id", "status", "created_at", "id"),
+        Index("ix_orders_user_created", "user_id", "created_at", "id"),
+        # Kitchen change feed
+        Index("ix_orders_restaurant_change_seq", "restaurant_id", "change_seq"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     restaurant_id = Column(Integer, ForeignKey("restaurants.id"))
     table_id = Column(Integer, ForeignKey("tables.id"))
     user_id = Column(Integer, ForeignKey("users.id"))
-    status = Column(String, default="pending") # pending, preparing, ready, completed, cancelled
+    status = Column(String, default=OrderStatus.PENDING) # pending, preparing, ready, completed, cancelled
+    version = Column(Integer, default=1, nullable=False) # Bumped on every status change (compare-and-swap)
     total_amount = Column(Numeric(10, 2))
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
+    change_seq = Column(Integer, nullable=True) # Restaurant.order_seq value at the last create/status change
 
     restaurant = relationship("Restaurant", back_populates="orders")
     table = relationship("Table")
@@ -29,3 +64,33 @@ class OrderItem(Base):
 
     order = relationship("Order", back_populates="items")
     menu_item = relationship("MenuItem")
+
+class OrderArchive(Base):
+    """
+    Completed / cancelled orders moved out of `orders` by services.archive_service.
+    """
+    __tablename__ = "orders_archive"
+    __table_args__ = (
+        Index("ix_orders_archive_restaurant_created", "restaurant_id", "created_at"),
+        Index("ix_orders_archive_user_created", "user_id", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    restaurant_id = Column(Integer)
+    table_id = Column(Integer)
+    user_id = Column(Integer)
+    status = Column(String)
+    total_amount = Column(Numeric(10, 2))
+    created_at = Column(Timestamp)
+    version = Column(Integer)
+    change_seq = Column(Integer)
+    archived_at = Column(Timestamp, server_default=func.now())
+
+class OrderItemArchive(Base):
+    __tablename__ = "order_items_archive"
+
+    id = Column(Integer, primary_key=True)
+    order_id = Column(Integer, index=True)
+    menu_item_id = Column(Integer, index=True)
+    quantity = Column(Integer)
+    price = Column(Numeric(10, 2))
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class OutboxEvent(Base):
+    """
+    Push notification or realtime event written in the same transaction as
+    the change that caused it, and delivered after commit by the outbox worker.
+    """
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        # Claiming scans undelivered events in id order
+        Index("ix_outbox_events_pending", "locked_until", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False) # push, realtime
+    payload = Column(JSON, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    locked_until = Column(DateTime, nullable=True) # Lease held by the worker delivering it
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
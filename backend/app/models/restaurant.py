@@ -1,5 +1,6 @@
 from sqlalchemy import Column, Integer, String, ForeignKey, Boolean
 from sqlalchemy.orm import relationship
+from app.core.config import settings
 from app.db.base import Base
 
 class Restaurant(Base):
@@ -11,6 +12,8 @@ class Restaurant(Base):
     address = Column(String)
     phone = Column(String)
     enable_time_clock = Column(Boolean, default=True)
+    order_seq = Column(Integer, default=0, nullable=False) # Last change sequence handed out to this restaurant's orders
+    menu_version = Column(Integer, default=0, nullable=False) # Bumped on every menu change (cache validator)
     
     owner = relationship("User", foreign_keys=[owner_id])
     tables = relationship("Table", back_populates="restaurant")
@@ -23,7 +26,6 @@ class Table(Base):
     id = Column(Integer, primary_key=True, index=True)
     restaurant_id = Column(Integer, ForeignKey("restaurants.id"))
     table_number = Column(String)
-    qr_code_url = Column(String, nullable=True)
     x = Column(Integer, default=0)
     y = Column(Integer, default=0)
     width = Column(Integer, default=100)
@@ -32,3 +34,8 @@ class Table(Base):
     rotation = Column(Integer, default=0)
 
     restaurant = relationship("Restaurant", back_populates="tables")
+
+    @property
+    def qr_code_url(self):
+        # Rendered on demand by GET /restaurants/{restaurant_id}/tables/{table_id}/qr
+        return f"{settings.API_V1_STR}/restaurants/{self.restaurant_id}/tables/{self.id}/qr"
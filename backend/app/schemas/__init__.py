@@ -1,11 +1,15 @@
 from .user import UserCreate, UserUpdate, User, SetPassword, EmployeeCreate, Token, TokenPayload, UserProfileUpdate, PasswordChange, UserStats
 from .restaurant import (
     RestaurantCreate, RestaurantUpdate, Restaurant,
-    TableCreate, TableUpdate, Table,
+    TableCreate, TableUpdate, Table, FloorPlanTable, FloorPlanUpdate,
     CategoryCreate, Category,
-    MenuItemCreate, MenuItemUpdate, MenuItem
+    MenuItemCreate, MenuItemUpdate, MenuItem, ImageVariant,
+    MenuImportRow, MenuImportError, MenuImportResult
+)
+from .order import (
+    OrderCreate, OrderItemCreate, Order, OrderItem, OrderChanges,
+    OrderVersionRef, OrderStatusBatchUpdate, OrderStatusConflict, OrderStatusBatchResult
 )
-from .order import OrderCreate, OrderItemCreate, Order, OrderItem
 from .request import RequestCreate, RequestUpdate, RequestResponse
 from .notification import (
     NotificationCreate,
@@ -16,3 +20,4 @@ from .notification import (
 )
 from .time_entry import TimeEntryCreate, TimeEntryUpdate, TimeEntryResponse, TimesheetSummary
 from .service_request import ServiceRequestCreate, ServiceRequestUpdate, ServiceRequestResponse
+from .metrics import StaticAssetStats, RealtimeEmitStats, PushDispatcherStats
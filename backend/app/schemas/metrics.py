@@ -0,0 +1,33 @@
+from pydantic import BaseModel
+
+
+class StaticAssetStats(BaseModel):
+    path: str
+    hits: int
+    not_modified: int
+    bytes: int
+
+
+class RealtimeEmitStats(BaseModel):
+    window_ms: float
+    events: int
+    superseded: int
+    frames: int
+    batched_frames: int
+    pending: int
+    frames_saved: int
+    avg_delay_ms: float
+    max_delay_ms: float
+
+
+class PushDispatcherStats(BaseModel):
+    queued: int
+    dropped: int
+    sent: int
+    failed: int
+    ticket_errors: int
+    requests: int
+    retries: int
+    pending: int
+    breaker: str
+    breaker_opened: int
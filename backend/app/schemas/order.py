@@ -17,7 +17,7 @@ class OrderItem(OrderItemBase):
     # We might want to include item details here for display
     
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class OrderBase(BaseModel):
     restaurant_id: int
@@ -34,8 +34,33 @@ class Order(OrderBase):
     status: str
     total_amount: Decimal
     created_at: datetime
+    version: Optional[int] = None
+    change_seq: Optional[int] = None
     items: List[OrderItem] = []
     table: Optional[Table] = None
 
     class Config:
-        orm_mode = True
+        from_attributes = True
+
+class OrderChanges(BaseModel):
+    seq: int
+    orders: List[Order] = []
+    has_more: bool = False
+
+class OrderVersionRef(BaseModel):
+    id: int
+    version: Optional[int] = None # Expected current version; omit to skip the check
+
+class OrderStatusBatchUpdate(BaseModel):
+    status: str
+    orders: List[OrderVersionRef]
+
+class OrderStatusConflict(BaseModel):
+    id: int
+    message: str
+    status: Optional[str] = None
+    version: Optional[int] = None
+
+class OrderStatusBatchResult(BaseModel):
+    updated: List[Order] = []
+    conflicts: List[OrderStatusConflict] = []
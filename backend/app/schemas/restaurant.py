@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel
 from decimal import Decimal
 
@@ -20,13 +20,47 @@ class MenuItemUpdate(MenuItemBase):
     price: Optional[Decimal] = None
     is_available: Optional[bool] = None
 
+class ImageVariant(BaseModel):
+    webp: str
+    jpeg: str
+    width: int
+    height: int
+
 class MenuItem(MenuItemBase):
     id: int
     restaurant_id: int
-    category_id: int
+    category_id: Optional[int] = None # Uncategorized items (e.g. imported without a category)
+    image_variants: Optional[Dict[str, ImageVariant]] = None # thumbnail / card / full
 
     class Config:
-        orm_mode = True
+        from_attributes = True
+
+class MenuImportRow(BaseModel):
+    """
+    One row of a bulk menu import / export. A row without a name only ensures
+    the category exists. Rows with an id update that item; otherwise an item
+    with the same name in the same category is updated, or a new one created.
+    Updates only change the fields present in the row, so an id alone with
+    e.g. a price is a valid partial update.
+    """
+    id: Optional[int] = None
+    category: Optional[str] = None
+    name: Optional[str] = None
+    description: Optional[str] = None
+    price: Optional[Decimal] = None
+    image_url: Optional[str] = None
+    is_active: bool = True
+    is_available: bool = True
+
+class MenuImportError(BaseModel):
+    row: int
+    message: str
+
+class MenuImportResult(BaseModel):
+    categories_created: int = 0
+    items_created: int = 0
+    items_updated: int = 0
+    errors: List[MenuImportError] = []
 
 # --- Category Schemas ---
 class CategoryBase(BaseModel):
@@ -41,7 +75,7 @@ class Category(CategoryBase):
     items: List[MenuItem] = []
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 # --- Table Schemas ---
 class TableBase(BaseModel):
@@ -71,7 +105,15 @@ class Table(TableBase):
     qr_code_url: Optional[str] = None
 
     class Config:
-        orm_mode = True
+        from_attributes = True
+
+class FloorPlanTable(TableUpdate):
+    id: Optional[int] = None # Existing table to update; omit to create one
+
+class FloorPlanUpdate(BaseModel):
+    tables: List[FloorPlanTable] = []
+    delete: List[int] = [] # Ids of tables to remove
+    replace: bool = False # Treat `tables` as the whole floor: tables not listed are removed
 
 # --- Restaurant Schemas ---
 class RestaurantBase(BaseModel):
@@ -96,4 +138,4 @@ class Restaurant(RestaurantBase):
     categories: List[Category] = []
 
     class Config:
-        orm_mode = True
+        from_attributes = True
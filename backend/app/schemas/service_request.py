@@ -24,4 +24,4 @@ class ServiceRequestResponse(ServiceRequestBase):
     table_number: Optional[str] = None # Helper for UI
 
     class Config:
-        orm_mode = True
+        from_attributes = True
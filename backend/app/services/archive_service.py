@@ -0,0 +1,199 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from sqlalchemy import delete, func, insert, literal, select, tuple_, union_all
+from sqlalchemy.orm import Session
+
+from app import schemas
+from app.core.config import settings
+from app.models.order import Order, OrderItem, OrderArchive, OrderItemArchive, OrderStatus
+from app.models.restaurant import Table
+
+ARCHIVED_STATUSES = [OrderStatus.COMPLETED, OrderStatus.CANCELLED]
+
+# Columns shared by the hot and archive tables
+ORDER_COLUMNS = ["id", "restaurant_id", "table_id", "user_id", "status", "total_amount", "created_at", "version", "change_seq"]
+ORDER_ITEM_COLUMNS = ["id", "order_id", "menu_item_id", "quantity", "price"]
+
+
+def archive_orders(
+    db: Session,
+    older_than_days: Optional[int] = None,
+    batch_size: Optional[int] = None
+) -> int:
+    """
+    Move completed / cancelled orders older than `older_than_days` (and their
+    items) into orders_archive / order_items_archive, committing once per batch.
+    Returns the number of orders archived.
+    """
+    days = settings.ORDER_ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    batch_size = batch_size or settings.ORDER_ARCHIVE_BATCH_SIZE
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+
+    orders = Order.__table__
+    items = OrderItem.__table__
+    archived = 0
+
+    while True:
+        order_ids = db.scalars(
+            select(orders.c.id).where(
+                orders.c.status.in_(ARCHIVED_STATUSES),
+                orders.c.created_at < cutoff
+            ).order_by(orders.c.id).limit(batch_size)
+        ).all()
+        if not order_ids:
+            break
+
+        db.execute(insert(OrderArchive.__table__).from_select(
+            ORDER_COLUMNS,
+            select(*[orders.c[name] for name in ORDER_COLUMNS]).where(orders.c.id.in_(order_ids))
+        ))
+        db.execute(insert(OrderItemArchive.__table__).from_select(
+            ORDER_ITEM_COLUMNS,
+            select(*[items.c[name] for name in ORDER_ITEM_COLUMNS]).where(items.c.order_id.in_(order_ids))
+        ))
+        db.execute(delete(items).where(items.c.order_id.in_(order_ids)))
+        db.execute(delete(orders).where(orders.c.id.in_(order_ids)))
+        db.commit()
+
+        archived += len(order_ids)
+        print(f"[INFO] Archived {archived} orders so far")
+
+    return archived
+
+
+def _scope(table, restaurant_id: Optional[int], user_id: Optional[int]) -> list:
+    conditions = []
+    if restaurant_id is not None:
+        conditions.append(table.c.restaurant_id == restaurant_id)
+    if user_id is not None:
+        conditions.append(table.c.user_id == user_id)
+    return conditions
+
+
+def archive_boundary(
+    db: Session,
+    restaurant_id: Optional[int] = None,
+    user_id: Optional[int] = None
+) -> Optional[datetime]:
+    """
+    created_at of the newest archived order of a restaurant / user (None if
+    nothing was archived). Read from the archive itself, so it holds whatever
+    --days the archive job ran with; one index lookup when scoped.
+    """
+    archive = OrderArchive.__table__
+    return db.scalar(
+        select(func.max(archive.c.created_at)).where(*_scope(archive, restaurant_id, user_id))
+    )
+
+
+def needs_archive(
+    db: Session,
+    since: Optional[datetime],
+    restaurant_id: Optional[int] = None,
+    user_id: Optional[int] = None
+) -> bool:
+    """
+    Whether a query over a restaurant's / user's orders created at or after
+    `since` (None meaning all time) can reach rows that have been archived.
+    """
+    boundary = archive_boundary(db, restaurant_id, user_id)
+    if boundary is None:
+        return False
+    if since is None:
+        return True
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if boundary.tzinfo is None:
+        boundary = boundary.replace(tzinfo=timezone.utc)
+    return since <= boundary
+
+
+def order_source(include_archive: bool):
+    """
+    Selectable with the order columns: the hot table alone, or the hot table
+    UNION ALL the archive when the query's range needs it. Query it via `.c`.
+    """
+    orders = Order.__table__
+    if not include_archive:
+        return orders
+    archive = OrderArchive.__table__
+    return union_all(
+        select(*[orders.c[name] for name in ORDER_COLUMNS]),
+        select(*[archive.c[name] for name in ORDER_COLUMNS])
+    ).subquery("all_orders")
+
+
+def order_item_source(include_archive: bool):
+    """
+    Like order_source, for order items.
+    """
+    items = OrderItem.__table__
+    if not include_archive:
+        return items
+    archive = OrderItemArchive.__table__
+    return union_all(
+        select(*[items.c[name] for name in ORDER_ITEM_COLUMNS]),
+        select(*[archive.c[name] for name in ORDER_ITEM_COLUMNS])
+    ).subquery("all_order_items")
+
+
+def load_archived_orders(
+    db: Session,
+    limit: int,
+    restaurant_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    statuses: Optional[List[str]] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    before: Optional[Tuple[datetime, int]] = None
+) -> List[schemas.Order]:
+    """
+    Archived orders of a restaurant / user, newest first, filtered like the
+    order list endpoints and positioned before the (created_at, id) keyset
+    `before`. Items and tables are loaded with one query each.
+    """
+    archive = OrderArchive.__table__
+    conditions = _scope(archive, restaurant_id, user_id)
+    if statuses:
+        conditions.append(archive.c.status.in_(statuses))
+    if start_date:
+        conditions.append(archive.c.created_at >= start_date)
+    if end_date:
+        conditions.append(archive.c.created_at <= end_date)
+    if before:
+        conditions.append(tuple_(archive.c.created_at, archive.c.id) < tuple_(
+            literal(before[0], archive.c.created_at.type),
+            literal(before[1], archive.c.id.type)
+        ))
+    rows = db.execute(
+        select(*[archive.c[name] for name in ORDER_COLUMNS])
+        .where(*conditions)
+        .order_by(archive.c.created_at.desc(), archive.c.id.desc())
+        .limit(limit)
+    ).mappings().all()
+    if not rows:
+        return []
+
+    archived_items = OrderItemArchive.__table__
+    items_by_order = defaultdict(list)
+    for item in db.execute(
+        select(*[archived_items.c[name] for name in ORDER_ITEM_COLUMNS])
+        .where(archived_items.c.order_id.in_([row["id"] for row in rows]))
+        .order_by(archived_items.c.id)
+    ).mappings():
+        items_by_order[item["order_id"]].append(schemas.OrderItem.model_validate(dict(item)))
+    # Tables deleted since the order was placed come back as None
+    tables = {
+        table.id: table
+        for table in db.query(Table).filter(Table.id.in_({row["table_id"] for row in rows})).all()
+    }
+
+    return [
+        schemas.Order.model_validate({
+            **row,
+            "items": items_by_order[row["id"]],
+            "table": schemas.Table.model_validate(tables[row["table_id"]]) if row["table_id"] in tables else None,
+        })
+        for row in rows
+    ]
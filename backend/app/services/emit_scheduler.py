@@ -0,0 +1,113 @@
+import asyncio
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple, Union
+
+Target = Union[str, Tuple[str, ...]]
+
+# Event name of a frame carrying several buffered events
+BATCH_EVENT = "events"
+
+
+class EmitScheduler:
+    """
+    Buffers Socket.IO emits per target (a room, or a tuple of rooms that
+    should receive each event once) for `window_seconds` and sends them as
+    one frame, so a burst of orders wakes each tablet once instead of once
+    per event.
+
+    Events queued with the same `key` (e.g. ("order_update", order_id))
+    replace each other inside a window: only the latest status is sent. A
+    window holding a single event sends it unchanged; otherwise the frame is
+    a BATCH_EVENT whose data is {"events": [{"event": ..., "data": ...}]} in
+    queue order. A window of 0 sends every event immediately.
+
+    With a RoomHistory, every frame is numbered and kept for replay.
+    """
+
+    def __init__(self, sio, window_seconds: float, history=None):
+        self.sio = sio
+        self.window_seconds = window_seconds
+        self.history = history
+        # target -> {key: (event, data, queued_at)}, in queue order
+        self._buffers: Dict[Target, Dict[Hashable, Tuple[str, Any, float]]] = {}
+        self._counters = {
+            "events": 0,
+            "superseded": 0,
+            "frames": 0,
+            "batched_frames": 0,
+            "delayed": 0,
+            "delay_ms_total": 0.0,
+            "delay_ms_max": 0.0,
+        }
+
+    async def emit(self, event: str, data: Any, to: Target, key: Optional[Hashable] = None) -> None:
+        self._counters["events"] += 1
+        if self.window_seconds <= 0:
+            await self._send(to, event, data)
+            return
+
+        now = time.monotonic()
+        buffer = self._buffers.get(to)
+        if buffer is None:
+            buffer = self._buffers[to] = {}
+            asyncio.get_running_loop().call_later(
+                self.window_seconds, lambda: asyncio.ensure_future(self.flush(to))
+            )
+        if key is None:
+            key = object()
+        elif key in buffer:
+            # Drop the superseded event; the new one moves to the end but
+            # keeps the original queue time for the delay metrics
+            self._counters["superseded"] += 1
+            queued_at = buffer.pop(key)[2]
+            buffer[key] = (event, data, queued_at)
+            return
+        buffer[key] = (event, data, now)
+
+    async def flush(self, to: Target) -> None:
+        buffer = self._buffers.pop(to, None)
+        if not buffer:
+            return
+        now = time.monotonic()
+        events = list(buffer.values())
+        self._counters["delayed"] += len(events)
+        for _, _, queued_at in events:
+            delay_ms = (now - queued_at) * 1000
+            self._counters["delay_ms_total"] += delay_ms
+            self._counters["delay_ms_max"] = max(self._counters["delay_ms_max"], delay_ms)
+
+        if len(events) == 1:
+            event, data, _ = events[0]
+            await self._send(to, event, data)
+        else:
+            self._counters["batched_frames"] += 1
+            await self._send(to, BATCH_EVENT, {"events": [{"event": event, "data": data} for event, data, _ in events]})
+
+    async def flush_all(self) -> None:
+        for to in list(self._buffers):
+            await self.flush(to)
+
+    async def _send(self, to: Target, event: str, data: Any) -> None:
+        self._counters["frames"] += 1
+        room = list(to) if isinstance(to, tuple) else to
+        if self.history is not None:
+            _, data = self.history.record(room if isinstance(room, list) else [room], event, data)
+        try:
+            await self.sio.emit(event, data, room=room)
+        except Exception as e:
+            print(f"[ERROR] Socket.IO emit of '{event}' to {room} failed: {e}")
+
+    def stats(self) -> dict:
+        counters = dict(self._counters)
+        pending = sum(len(buffer) for buffer in self._buffers.values())
+        return {
+            "window_ms": self.window_seconds * 1000,
+            "events": counters["events"],
+            "superseded": counters["superseded"],
+            "frames": counters["frames"],
+            "batched_frames": counters["batched_frames"],
+            "pending": pending,
+            "frames_saved": counters["events"] - pending - counters["frames"],
+            "avg_delay_ms": round(counters["delay_ms_total"] / max(counters["delayed"], 1), 3),
+            "max_delay_ms": round(counters["delay_ms_max"], 3),
+        }
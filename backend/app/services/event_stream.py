@@ -0,0 +1,128 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Set, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+
+class Subscriber:
+    """
+    One open event stream: a bounded queue of (event, data) for its rooms.
+    A subscriber that falls `max_queue` events behind is marked overflowed;
+    its stream ends so the client reconnects and resumes from Last-Event-ID.
+    """
+    __slots__ = ("rooms", "queue", "overflowed")
+
+    def __init__(self, rooms: Sequence[str], max_queue: int):
+        self.rooms = tuple(rooms)
+        self.queue: "asyncio.Queue[Tuple[str, Any]]" = asyncio.Queue(maxsize=max_queue)
+        self.overflowed = False
+
+
+class EventBroker:
+    """
+    Per-worker fan-out of realtime events to Server-Sent Events subscribers,
+    fed with every room emit the worker's Socket.IO manager delivers.
+    """
+
+    def __init__(self, max_queue: int):
+        self.max_queue = max_queue
+        self._rooms: Dict[str, Set[Subscriber]] = {}
+        self.overflows = 0
+
+    def subscribe(self, rooms: Sequence[str]) -> Subscriber:
+        subscriber = Subscriber(rooms, self.max_queue)
+        for room in subscriber.rooms:
+            self._rooms.setdefault(room, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        for room in subscriber.rooms:
+            subscribers = self._rooms.get(room)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._rooms[room]
+
+    def subscriber_count(self) -> int:
+        return len({subscriber for subscribers in self._rooms.values() for subscriber in subscribers})
+
+    async def publish(self, event: str, data: Any, room) -> None:
+        rooms = room if isinstance(room, (list, tuple)) else [room]
+        targets = set()
+        for name in rooms:
+            targets.update(self._rooms.get(name, ()))
+        for subscriber in targets:
+            if subscriber.overflowed:
+                continue
+            try:
+                subscriber.queue.put_nowait((event, data))
+            except asyncio.QueueFull:
+                subscriber.overflowed = True
+                self.overflows += 1
+
+
+def format_sse(data: Any, event: Optional[str] = None, id: Optional[str] = None) -> str:
+    lines = []
+    if id is not None:
+        lines.append(f"id: {id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(jsonable_encoder(data), separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+def event_id(data: Any) -> Optional[str]:
+    # Frames numbered by RoomHistory resume from "epoch:seq"
+    if isinstance(data, dict) and "seq" in data and "epoch" in data:
+        return f"{data['epoch']}:{data['seq']}"
+    return None
+
+
+def parse_event_id(last_event_id: Optional[str]) -> Optional[Tuple[str, int]]:
+    epoch, _, seq = (last_event_id or "").partition(":")
+    if not epoch or not seq.isdigit():
+        return None
+    return epoch, int(seq)
+
+
+async def stream_events(
+    broker: EventBroker,
+    history,
+    rooms: List[str],
+    last_event_id: Optional[str],
+    heartbeat_seconds: float,
+    retry_ms: int = 3000,
+) -> AsyncIterator[str]:
+    """
+    Server-Sent Events for `rooms`: the frames missed since `last_event_id`
+    (or a `resync` event when they are gone), then live events, with a
+    comment line every `heartbeat_seconds` to keep proxies from closing an
+    idle connection.
+    """
+    subscriber = broker.subscribe(rooms)
+    try:
+        yield f"retry: {retry_ms}\n\n"
+        last_seen = parse_event_id(last_event_id)
+        if last_event_id is not None:
+            frames = history.since(rooms, last_seen[0], last_seen[1]) if last_seen else None
+            if frames is None:
+                yield format_sse({"epoch": history.epoch, "seq": history.seq}, event="resync", id=f"{history.epoch}:{history.seq}")
+                last_seen = (history.epoch, history.seq)
+            for frame in frames or []:
+                yield format_sse(frame["data"], event=frame["event"], id=event_id(frame["data"]))
+                last_seen = (frame["data"]["epoch"], frame["data"]["seq"])
+
+        while not subscriber.overflowed:
+            try:
+                event, data = await asyncio.wait_for(subscriber.queue.get(), heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            id = event_id(data)
+            # Frames already sent as part of the replay
+            if id and last_seen and data["epoch"] == last_seen[0] and data["seq"] <= last_seen[1]:
+                continue
+            yield format_sse(data, event=event, id=id)
+    finally:
+        broker.unsubscribe(subscriber)
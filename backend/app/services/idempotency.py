@@ -0,0 +1,122 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+
+
+class _Entry:
+    __slots__ = ("fingerprint", "response", "expires_at")
+
+    def __init__(self, fingerprint: str, expires_at: float):
+        self.fingerprint = fingerprint
+        self.response = None
+        self.expires_at = expires_at
+
+
+class IdempotentClaim:
+    """
+    Handle returned by IdempotencyStore.claim().
+
+    `replay` holds the stored response when the key was already used;
+    otherwise the endpoint does its work and passes its result to save().
+    """
+
+    def __init__(self, store: "IdempotencyStore", scoped_key: Optional[str], replay: Optional[JSONResponse] = None):
+        self._store = store
+        self._scoped_key = scoped_key
+        self._saved = False
+        self.replay = replay
+
+    def save(self, response: Any) -> Any:
+        if self._scoped_key is not None:
+            self._store._complete(self._scoped_key, jsonable_encoder(response))
+            self._saved = True
+        return response
+
+    def __enter__(self) -> "IdempotentClaim":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        # Failed or abandoned requests free the key so the client can retry
+        if self._scoped_key is not None and self.replay is None and not self._saved:
+            self._store._release(self._scoped_key)
+        return False
+
+
+class IdempotencyStore:
+    """
+    Bounded in-process store of first responses keyed by Idempotency-Key.
+
+    Entries expire after `ttl_seconds`; once `max_keys` is reached the oldest
+    entries are evicted first.
+    """
+
+    def __init__(self, max_keys: int, ttl_seconds: int):
+        self.max_keys = max_keys
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def claim(self, scope: str, owner: Any, key: Optional[str], payload: Any) -> IdempotentClaim:
+        """
+        Claim `key` for this request, or get back the response stored for it.
+
+        Keys are scoped per endpoint and per caller. Reusing a key with a
+        different payload is rejected with 422, and a retry that arrives
+        while the first request is still running gets 409.
+        """
+        if not key:
+            return IdempotentClaim(self, None)
+
+        scoped_key = f"{scope}:{owner}:{key}"
+        fingerprint = hashlib.sha256(
+            json.dumps(jsonable_encoder(payload), sort_keys=True).encode()
+        ).hexdigest()
+        now = time.monotonic()
+
+        with self._lock:
+            self._evict(now)
+            entry = self._entries.get(scoped_key)
+            if entry is None:
+                self._entries[scoped_key] = _Entry(fingerprint, now + self.ttl_seconds)
+                return IdempotentClaim(self, scoped_key)
+
+            if entry.fingerprint != fingerprint:
+                raise HTTPException(status_code=422, detail="Idempotency-Key was already used with a different request")
+            if entry.response is None:
+                raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+            replay = JSONResponse(content=entry.response, headers={"Idempotent-Replayed": "true"})
+
+        return IdempotentClaim(self, scoped_key, replay=replay)
+
+    def _complete(self, scoped_key: str, response: Any) -> None:
+        with self._lock:
+            entry = self._entries.get(scoped_key)
+            if entry is not None:
+                entry.response = response
+
+    def _release(self, scoped_key: str) -> None:
+        with self._lock:
+            self._entries.pop(scoped_key, None)
+
+    def _evict(self, now: float) -> None:
+        # Entries are kept in insertion order, so expired ones are at the front
+        while self._entries:
+            oldest_key, oldest = next(iter(self._entries.items()))
+            if oldest.expires_at > now and len(self._entries) < self.max_keys:
+                break
+            del self._entries[oldest_key]
+
+
+idempotency_store = IdempotencyStore(
+    max_keys=settings.IDEMPOTENCY_MAX_KEYS,
+    ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+)
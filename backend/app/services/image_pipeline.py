@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, Tuple
+
+from fastapi import HTTPException, UploadFile
+
+from app.core.config import settings
+from app.services.process_pool import run_in_process
+
+# Longest side, in pixels, of each generated variant
+IMAGE_VARIANTS = {
+    "thumbnail": 160,
+    "card": 480,
+    "full": 1280,
+}
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def variant_filename(digest: str, variant: str, fmt: str) -> str:
+    return f"{digest}-{variant}.{'jpg' if fmt == 'jpeg' else fmt}"
+
+
+def _manifest_path(out_dir: str, digest: str) -> str:
+    # Written after every variant of an image, so its presence means the set is complete
+    return os.path.join(out_dir, f"{digest}.json")
+
+
+def _write_atomic(image, path: str, **save_args) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    image.save(tmp_path, **save_args)
+    os.replace(tmp_path, path)
+
+
+def render_variants(source_path: str, digest: str, out_dir: str, url_prefix: str) -> Dict[str, dict]:
+    """
+    Decode an uploaded image and write WebP and JPEG copies of every variant
+    in IMAGE_VARIANTS. Runs inside the process pool. Raises ValueError if the
+    file is not an image Pillow can read.
+    """
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    try:
+        with Image.open(source_path) as original:
+            original.load()
+            image = ImageOps.exif_transpose(original)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+        raise ValueError("Unsupported or corrupt image file")
+
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB")
+
+    variants = {}
+    for variant, size in IMAGE_VARIANTS.items():
+        resized = image.copy()
+        resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+
+        # JPEG has no alpha channel: flatten onto white
+        flat = resized
+        if resized.mode == "RGBA":
+            flat = Image.new("RGB", resized.size, (255, 255, 255))
+            flat.paste(resized, mask=resized.getchannel("A"))
+
+        webp_name = variant_filename(digest, variant, "webp")
+        jpeg_name = variant_filename(digest, variant, "jpeg")
+        _write_atomic(resized, os.path.join(out_dir, webp_name), format="WEBP", quality=80, method=4)
+        _write_atomic(flat, os.path.join(out_dir, jpeg_name), format="JPEG", quality=82, optimize=True, progressive=True)
+        variants[variant] = {
+            "webp": f"{url_prefix}/{webp_name}",
+            "jpeg": f"{url_prefix}/{jpeg_name}",
+            "width": resized.width,
+            "height": resized.height,
+        }
+
+    manifest_path = _manifest_path(out_dir, digest)
+    with open(f"{manifest_path}.{os.getpid()}.tmp", "w") as f:
+        json.dump(variants, f)
+    os.replace(f"{manifest_path}.{os.getpid()}.tmp", manifest_path)
+    return variants
+
+
+def save_upload(upload: UploadFile, directory: str) -> Tuple[str, str]:
+    """
+    Copy an upload to a temporary file in `directory` in fixed-size chunks,
+    hashing it on the way. Returns (sha256 hex digest, temp path).
+    Raises 413 once the upload exceeds IMAGE_UPLOAD_MAX_BYTES.
+    """
+    os.makedirs(directory, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".upload")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = upload.file.read(_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > settings.IMAGE_UPLOAD_MAX_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Image is larger than {settings.IMAGE_UPLOAD_MAX_BYTES // (1024 * 1024)} MB"
+                    )
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return digest.hexdigest(), tmp_path
+
+
+def process_image_upload(upload: UploadFile) -> Dict[str, dict]:
+    """
+    Store an uploaded menu image as resized WebP / JPEG variants named by the
+    content hash of the upload, and return their URLs and sizes by variant.
+
+    Identical uploads are only processed once. Decoding and encoding happen in
+    a separate process so Pillow never holds up the API workers.
+    """
+    out_dir = settings.IMAGE_UPLOAD_DIR
+    digest, tmp_path = save_upload(upload, out_dir)
+    try:
+        try:
+            with open(_manifest_path(out_dir, digest)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            pass
+        return run_in_process(render_variants, tmp_path, digest, out_dir, settings.IMAGE_URL_PREFIX)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        os.remove(tmp_path)
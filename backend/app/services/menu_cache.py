@@ -0,0 +1,147 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.restaurant import Restaurant
+
+# Called with a restaurant id after a transaction that changed its menu commits
+_menu_change_listeners = []
+
+
+def on_menu_change(listener: Callable[[int], None]) -> Callable[[int], None]:
+    """
+    Register a callback run after a commit that bumped a restaurant's menu version.
+    """
+    _menu_change_listeners.append(listener)
+    return listener
+
+
+def bump_menu_version(db: Session, restaurant_id: int) -> None:
+    """
+    Bump a restaurant's menu version in the current transaction.
+    Cached menu responses are invalidated once the transaction commits.
+    """
+    db.execute(
+        update(Restaurant)
+        .where(Restaurant.id == restaurant_id)
+        .values(menu_version=func.coalesce(Restaurant.menu_version, 0) + 1)
+        .execution_options(synchronize_session=False)
+    )
+    db.info.setdefault("menu_changed", set()).add(restaurant_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    for restaurant_id in session.info.pop("menu_changed", ()):
+        for listener in _menu_change_listeners:
+            listener(restaurant_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop("menu_changed", None)
+
+
+class MenuCache:
+    """
+    Per-worker cache of pre-serialized public menu responses.
+
+    Bodies are keyed by (restaurant_id, kind) and tagged with the restaurant's
+    menu version. The version itself is re-read from the database at most
+    every MENU_VERSION_RECHECK_SECONDS, or immediately after a local change,
+    so changes made through other workers are picked up too.
+    """
+
+    def __init__(self, max_entries: int, recheck_seconds: int):
+        self.max_entries = max_entries
+        self.recheck_seconds = recheck_seconds
+        self._versions: Dict[int, Tuple[int, float]] = {}
+        self._bodies: "OrderedDict[Tuple[int, str], Tuple[int, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def invalidate(self, restaurant_id: int) -> None:
+        with self._lock:
+            self._versions.pop(restaurant_id, None)
+
+    def version(self, db: Session, restaurant_id: int) -> int:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._versions.get(restaurant_id)
+        if cached and now - cached[1] < self.recheck_seconds:
+            return cached[0]
+
+        version = db.execute(
+            select(Restaurant.menu_version).where(Restaurant.id == restaurant_id)
+        ).scalar() or 0
+        with self._lock:
+            self._versions[restaurant_id] = (version, now)
+        return version
+
+    def body(self, db: Session, restaurant_id: int, kind: str, build: Callable[[], Any]) -> Tuple[int, bytes]:
+        """
+        Return (version, JSON body) for a menu resource, rebuilding it only
+        when the restaurant's menu version has moved on.
+        """
+        version = self.version(db, restaurant_id)
+        key = (restaurant_id, kind)
+        with self._lock:
+            cached = self._bodies.get(key)
+            if cached and cached[0] == version:
+                self._bodies.move_to_end(key)
+                return cached
+
+        body = json.dumps(jsonable_encoder(build()), separators=(",", ":")).encode()
+        with self._lock:
+            self._bodies[key] = (version, body)
+            self._bodies.move_to_end(key)
+            while len(self._bodies) > self.max_entries:
+                self._bodies.popitem(last=False)
+        return version, body
+
+
+menu_cache = MenuCache(
+    max_entries=settings.MENU_CACHE_MAX_ENTRIES,
+    recheck_seconds=settings.MENU_VERSION_RECHECK_SECONDS,
+)
+on_menu_change(menu_cache.invalidate)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Whether the request's If-None-Match already names `etag`.
+    """
+    if_none_match: Optional[str] = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+
+
+def cached_menu_response(
+    request: Request,
+    db: Session,
+    restaurant_id: int,
+    kind: str,
+    build: Callable[[], Any]
+) -> Response:
+    """
+    Serve a public menu resource from the cache with ETag / Cache-Control
+    headers, answering 304 when the client already has the current version.
+    """
+    version, body = menu_cache.body(db, restaurant_id, kind, build)
+    headers = {
+        "ETag": f'"{kind}-{restaurant_id}-v{version}"',
+        "Cache-Control": f"public, max-age={settings.MENU_CACHE_MAX_AGE}",
+    }
+    if etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,302 @@
+import codecs
+import csv
+import io
+import json
+from decimal import Decimal
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import ValidationError
+from sqlalchemy import exists, insert, select, update
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.menu_cache import bump_menu_version
+
+# Column order of CSV exports and imports
+MENU_COLUMNS = ["id", "category", "name", "description", "price", "image_url", "is_active", "is_available"]
+
+_READ_SIZE = 64 * 1024
+_EXPORT_BATCH_SIZE = 500
+
+
+# --- Parsing ---
+
+def iter_csv_rows(file: IO[bytes]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield rows of an uploaded CSV file one at a time. Empty cells are dropped
+    so schema defaults apply to new items and existing items keep their values.
+    """
+    reader = csv.DictReader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    for row in reader:
+        yield {key: value for key, value in row.items() if key and value not in (None, "")}
+
+
+def iter_json_rows(file: IO[bytes]) -> Iterator[Any]:
+    """
+    Yield the objects of an uploaded JSON array, or of newline-delimited JSON,
+    decoding the file a chunk at a time instead of loading it whole.
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    eof = False
+    in_array = None
+
+    while True:
+        buffer = buffer.lstrip()
+        if in_array is not None and buffer[:1] == ",":
+            buffer = buffer[1:].lstrip()
+        if in_array is None and buffer:
+            in_array = buffer[0] == "["
+            if in_array:
+                buffer = buffer[1:]
+                continue
+        if in_array and buffer[:1] == "]":
+            return
+        if buffer:
+            try:
+                value, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(buffer) or eof:
+                    yield value
+                    buffer = buffer[end:]
+                    continue
+        if eof:
+            if in_array:
+                raise json.JSONDecodeError("Unterminated array", buffer, len(buffer))
+            return
+        chunk = file.read(_READ_SIZE)
+        eof = not chunk
+        buffer += text.decode(chunk, final=eof)
+
+
+def parse_menu_file(file: IO[bytes], filename: Optional[str], content_type: Optional[str]) -> Iterator[Any]:
+    """
+    Pick a row parser from the upload's extension or content type (CSV or JSON).
+    """
+    name = (filename or "").lower()
+    if name.endswith(".csv") or (content_type or "").startswith("text/csv"):
+        return iter_csv_rows(file)
+    return iter_json_rows(file)
+
+
+def _chunks(rows: Iterable[Any], size: int) -> Iterator[List[Tuple[int, Any]]]:
+    chunk = []
+    for number, row in enumerate(rows, start=1):
+        chunk.append((number, row))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# --- Import ---
+
+def _import_chunk(
+    db: Session,
+    restaurant_id: int,
+    chunk: List[Tuple[int, Any]],
+    category_ids: Dict[str, int],
+    result: schemas.MenuImportResult,
+) -> None:
+    def error(number: int, message: str) -> None:
+        if len(result.errors) < settings.MENU_IMPORT_MAX_ERRORS:
+            result.errors.append(schemas.MenuImportError(row=number, message=message))
+
+    valid: List[Tuple[int, schemas.MenuImportRow]] = []
+    for number, raw in chunk:
+        try:
+            row = schemas.MenuImportRow.model_validate(raw)
+        except ValidationError as e:
+            error(number, "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+            continue
+        if row.id is None and row.name is None and row.category is None:
+            error(number, "Row needs an id, a name or a category")
+            continue
+        valid.append((number, row))
+
+    # Categories are matched by name and created as needed
+    new_categories = {row.category for _, row in valid if row.category is not None} - category_ids.keys()
+    if new_categories:
+        for category_id, name in db.execute(
+            insert(models.Category).returning(models.Category.id, models.Category.name),
+            [{"restaurant_id": restaurant_id, "name": name} for name in sorted(new_categories)]
+        ):
+            category_ids[name] = category_id
+        result.categories_created += len(new_categories)
+
+    item_rows = [(number, row) for number, row in valid if row.id is not None or row.name is not None]
+    if not item_rows:
+        return
+
+    # One query finds every existing item the chunk could refer to
+    by_id: Dict[int, Optional[str]] = {}
+    by_key: Dict[Tuple[Optional[int], str], int] = {}
+    for item_id, category_id, name, image_url in db.execute(
+        select(models.MenuItem.id, models.MenuItem.category_id, models.MenuItem.name, models.MenuItem.image_url).where(
+            models.MenuItem.restaurant_id == restaurant_id,
+            models.MenuItem.id.in_([row.id for _, row in item_rows if row.id is not None])
+            | models.MenuItem.name.in_(list({row.name for _, row in item_rows if row.name is not None}))
+        )
+    ):
+        by_id[item_id] = image_url
+        by_key[(category_id, name)] = item_id
+
+    inserts: Dict[Tuple[Optional[int], str], dict] = {}
+    updates: Dict[int, dict] = {}
+    for number, row in item_rows:
+        # Items exported without a category come back with an empty one
+        category_id = category_ids[row.category] if row.category is not None else None
+        key = (category_id, row.name)
+
+        if row.id is not None:
+            if row.id not in by_id:
+                error(number, f"Menu item {row.id} not found")
+                continue
+            item_id = row.id
+        else:
+            item_id = by_key.get(key)
+
+        if item_id is not None:
+            # Only the fields present in the row change; blank cells keep the current values
+            values = row.model_dump(exclude={"id", "category"}, exclude_unset=True)
+            if "category" in row.model_fields_set:
+                values["category_id"] = category_id
+            if "image_url" in values and values["image_url"] != by_id[item_id]:
+                # The resized variants belong to the old image
+                values["image_variants"] = None
+            # Several rows for one item: later fields win, earlier ones are kept
+            updates[item_id] = {**updates.get(item_id, {}), "id": item_id, **values}
+        elif row.price is None:
+            error(number, "price: Field required")
+        else:
+            # Repeated rows for the same new item: the last one wins
+            values = row.model_dump(exclude={"id", "category"})
+            inserts[key] = {"restaurant_id": restaurant_id, "category_id": category_id, **values}
+
+    if inserts:
+        db.execute(insert(models.MenuItem), list(inserts.values()))
+        result.items_created += len(inserts)
+    if updates:
+        # Rows set different columns; group them so each UPDATE is one executemany
+        by_columns: Dict[Tuple[str, ...], List[dict]] = {}
+        for values in updates.values():
+            by_columns.setdefault(tuple(sorted(values)), []).append(values)
+        for batch in by_columns.values():
+            db.execute(update(models.MenuItem), batch)
+        result.items_updated += len(updates)
+
+
+def import_menu(db: Session, restaurant_id: int, rows: Iterable[Any]) -> schemas.MenuImportResult:
+    """
+    Upsert categories and menu items from a stream of rows.
+
+    Rows are validated and written MENU_IMPORT_CHUNK_SIZE at a time, each chunk
+    as one transaction with batched executemany INSERTs and UPDATEs. Invalid
+    rows are skipped and reported. The menu version is bumped once, after the
+    last chunk, so caches and snapshots are rebuilt a single time.
+    """
+    result = schemas.MenuImportResult()
+    category_ids: Dict[str, int] = {
+        name: category_id
+        for category_id, name in db.execute(
+            select(models.Category.id, models.Category.name).where(models.Category.restaurant_id == restaurant_id)
+        )
+    }
+
+    try:
+        for chunk in _chunks(rows, settings.MENU_IMPORT_CHUNK_SIZE):
+            try:
+                _import_chunk(db, restaurant_id, chunk, category_ids, result)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+    finally:
+        # Chunks committed before a failure still need their caches refreshed
+        if result.categories_created or result.items_created or result.items_updated:
+            bump_menu_version(db, restaurant_id)
+            db.commit()
+    return result
+
+
+# --- Export ---
+
+def iter_menu_rows(restaurant_id: int) -> Iterator[Dict[str, Any]]:
+    """
+    Yield every category and menu item of a restaurant as MENU_COLUMNS dicts,
+    reading items in keyset batches. Uses its own session because it runs
+    while the response is being streamed.
+    """
+    db = SessionLocal()
+    try:
+        last_id = 0
+        while True:
+            batch = db.execute(
+                select(models.MenuItem, models.Category.name)
+                .outerjoin(models.MenuItem.category)
+                .where(models.MenuItem.restaurant_id == restaurant_id, models.MenuItem.id > last_id)
+                .order_by(models.MenuItem.id)
+                .limit(_EXPORT_BATCH_SIZE)
+            ).all()
+            if not batch:
+                break
+            for item, category_name in batch:
+                yield {
+                    "id": item.id,
+                    "category": category_name,
+                    "name": item.name,
+                    "description": item.description,
+                    "price": item.price,
+                    "image_url": item.image_url,
+                    "is_active": item.is_active,
+                    "is_available": item.is_available,
+                }
+            last_id = batch[-1][0].id
+            db.expunge_all()
+
+        # Categories without items are exported as name-less rows
+        for (category_name,) in db.execute(
+            select(models.Category.name).where(
+                models.Category.restaurant_id == restaurant_id,
+                ~exists().where(models.MenuItem.category_id == models.Category.id)
+            ).order_by(models.Category.id)
+        ):
+            yield {"category": category_name}
+    finally:
+        db.close()
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value
+
+
+def export_menu_csv(restaurant_id: int) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=MENU_COLUMNS)
+    writer.writeheader()
+    for row in iter_menu_rows(restaurant_id):
+        writer.writerow({key: _csv_value(value) for key, value in row.items()})
+        if buffer.tell() >= _READ_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def export_menu_json(restaurant_id: int) -> Iterator[str]:
+    separator = "[\n"
+    for row in iter_menu_rows(restaurant_id):
+        yield separator + json.dumps(jsonable_encoder(row, custom_encoder={Decimal: str}))
+        separator = ",\n"
+    yield "[]" if separator == "[\n" else "\n]\n"
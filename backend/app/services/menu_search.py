@@ -0,0 +1,209 @@
+import re
+from typing import List, Optional
+
+from sqlalchemy import and_, inspect, or_, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app import models
+
+# Set by ensure_search_index(): "fts5", "tsvector", or None for ILIKE scans
+_backend: Optional[str] = None
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# SQLite: FTS5 table keyed by menu_items.id, kept in sync by triggers.
+# Columns are (name, category, description) so bm25() can weight them in that order.
+_SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS menu_items_fts USING fts5(
+        name, category, description,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS menu_items_fts_insert AFTER INSERT ON menu_items BEGIN
+        INSERT INTO menu_items_fts(rowid, name, category, description)
+        VALUES (new.id, new.name, (SELECT name FROM categories WHERE id = new.category_id), new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS menu_items_fts_update
+    AFTER UPDATE OF name, description, category_id ON menu_items BEGIN
+        DELETE FROM menu_items_fts WHERE rowid = old.id;
+        INSERT INTO menu_items_fts(rowid, name, category, description)
+        VALUES (new.id, new.name, (SELECT name FROM categories WHERE id = new.category_id), new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS menu_items_fts_delete AFTER DELETE ON menu_items BEGIN
+        DELETE FROM menu_items_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS menu_items_fts_category AFTER UPDATE OF name ON categories BEGIN
+        UPDATE menu_items_fts SET category = new.name
+        WHERE rowid IN (SELECT id FROM menu_items WHERE category_id = new.id);
+    END
+    """,
+]
+
+_SQLITE_BACKFILL = """
+    INSERT INTO menu_items_fts(rowid, name, category, description)
+    SELECT menu_items.id, menu_items.name, categories.name, menu_items.description
+    FROM menu_items LEFT JOIN categories ON categories.id = menu_items.category_id
+"""
+
+# Postgres: a trigger-maintained tsvector column with a GIN index. The category
+# name lives in another table, so it cannot be a plain expression index.
+_POSTGRES_DDL = [
+    "ALTER TABLE menu_items ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    "CREATE INDEX IF NOT EXISTS ix_menu_items_search_vector ON menu_items USING GIN (search_vector)",
+    """
+    CREATE OR REPLACE FUNCTION menu_items_search_vector() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', coalesce(NEW.name, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce((SELECT name FROM categories WHERE id = NEW.category_id), '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(NEW.description, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS menu_items_search_vector ON menu_items",
+    """
+    CREATE TRIGGER menu_items_search_vector
+    BEFORE INSERT OR UPDATE OF name, description, category_id ON menu_items
+    FOR EACH ROW EXECUTE FUNCTION menu_items_search_vector()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION categories_search_vector() RETURNS trigger AS $$
+    BEGIN
+        UPDATE menu_items SET name = name WHERE category_id = NEW.id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS categories_search_vector ON categories",
+    """
+    CREATE TRIGGER categories_search_vector
+    AFTER UPDATE OF name ON categories
+    FOR EACH ROW EXECUTE FUNCTION categories_search_vector()
+    """,
+    # Backfill rows written before the trigger existed
+    "UPDATE menu_items SET name = name WHERE search_vector IS NULL",
+]
+
+
+def ensure_search_index(engine: Engine) -> Optional[str]:
+    """
+    Create the full-text index for menu items (and the triggers that keep it
+    in sync with menu_items / categories), backfilling it on first creation.
+    Safe to call on every start-up. Returns the backend in use, or None when
+    the database has no supported full-text engine and search falls back to ILIKE.
+    """
+    global _backend
+    dialect = engine.dialect.name
+    try:
+        with engine.begin() as conn:
+            if dialect == "sqlite":
+                is_new = not inspect(conn).has_table("menu_items_fts")
+                for statement in _SQLITE_DDL:
+                    conn.execute(text(statement))
+                if is_new:
+                    conn.execute(text(_SQLITE_BACKFILL))
+                _backend = "fts5"
+            elif dialect == "postgresql":
+                for statement in _POSTGRES_DDL:
+                    conn.execute(text(statement))
+                _backend = "tsvector"
+            else:
+                _backend = None
+    except DBAPIError as e:
+        print(f"[WARN] Full-text menu search unavailable, falling back to ILIKE: {e}")
+        _backend = None
+    return _backend
+
+
+def search_tokens(q: str) -> List[str]:
+    """
+    Split a search string into the words the index understands; punctuation and
+    query-syntax characters are dropped so user input can never break the query.
+    """
+    return [token.lower() for token in _TOKEN_RE.findall(q)]
+
+
+def _fts5_search(db: Session, restaurant_id: int, tokens: List[str], limit: int) -> List[int]:
+    # Every word must match as a prefix
+    match = " ".join(f'"{token}"*' for token in tokens)
+    return db.scalars(text("""
+        SELECT menu_items.id
+        FROM menu_items_fts
+        JOIN menu_items ON menu_items.id = menu_items_fts.rowid
+        WHERE menu_items_fts MATCH :match
+          AND menu_items.restaurant_id = :restaurant_id
+          AND menu_items.is_active = 1
+        ORDER BY bm25(menu_items_fts, 10.0, 4.0, 1.0)
+        LIMIT :limit
+    """), {"match": match, "restaurant_id": restaurant_id, "limit": limit}).all()
+
+
+def _tsvector_search(db: Session, restaurant_id: int, tokens: List[str], limit: int) -> List[int]:
+    tsquery = " & ".join(f"{token}:*" for token in tokens)
+    return db.scalars(text("""
+        SELECT id
+        FROM menu_items
+        WHERE search_vector @@ to_tsquery('simple', :tsquery)
+          AND restaurant_id = :restaurant_id
+          AND is_active
+        ORDER BY ts_rank(search_vector, to_tsquery('simple', :tsquery)) DESC, id
+        LIMIT :limit
+    """), {"tsquery": tsquery, "restaurant_id": restaurant_id, "limit": limit}).all()
+
+
+def ilike_search(db: Session, restaurant_id: int, tokens: List[str], limit: int) -> List[int]:
+    """
+    Substring scan over name, description and category name; every word must
+    appear somewhere. Used when no full-text index is available.
+    """
+    def pattern(token: str) -> str:
+        escaped = token.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return f"%{escaped}%"
+
+    return db.scalars(select(models.MenuItem.id).outerjoin(models.MenuItem.category).where(
+        models.MenuItem.restaurant_id == restaurant_id,
+        models.MenuItem.is_active == True,
+        and_(*[
+            or_(
+                models.MenuItem.name.ilike(pattern(token), escape="\\"),
+                models.MenuItem.description.ilike(pattern(token), escape="\\"),
+                models.Category.name.ilike(pattern(token), escape="\\"),
+            )
+            for token in tokens
+        ])
+    ).order_by(models.MenuItem.name, models.MenuItem.id).limit(limit)).all()
+
+
+def search_menu_items(db: Session, restaurant_id: int, q: str, limit: int = 20) -> List[models.MenuItem]:
+    """
+    Active menu items of a restaurant matching `q`, best match first.
+
+    Words match by prefix, so "chick sand" finds "Chicken Sandwich". Name
+    matches rank above category matches, which rank above description matches.
+    """
+    tokens = search_tokens(q)
+    if not tokens:
+        return []
+
+    if _backend == "fts5":
+        ids = _fts5_search(db, restaurant_id, tokens, limit)
+    elif _backend == "tsvector":
+        ids = _tsvector_search(db, restaurant_id, tokens, limit)
+    else:
+        ids = ilike_search(db, restaurant_id, tokens, limit)
+    if not ids:
+        return []
+
+    items = {item.id: item for item in db.query(models.MenuItem).filter(models.MenuItem.id.in_(ids)).all()}
+    return [items[item_id] for item_id in ids if item_id in items]
@@ -0,0 +1,175 @@
+import gzip
+import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Dict, NamedTuple, Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.menu_cache import menu_cache, on_menu_change
+
+
+class MenuSnapshot(NamedTuple):
+    version: int
+    gzipped: bytes
+
+
+_snapshots: Dict[int, MenuSnapshot] = {}
+_pending: Dict[int, Future] = {}
+# Latest rebuild per restaurant, queued or running, until it finishes
+_in_flight: Dict[int, Future] = {}
+_lock = threading.Lock()
+# A single worker thread: rebuilds are rare and must not compete with requests
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="menu-snapshot")
+
+
+def _snapshot_path(restaurant_id: int, version: int) -> str:
+    return os.path.join(settings.MENU_SNAPSHOT_DIR, f"{restaurant_id}-v{version}.json.gz")
+
+
+def build_snapshot(db: Session, restaurant_id: int) -> Optional[MenuSnapshot]:
+    """
+    Build the full customer menu document for a restaurant: header, categories
+    and their active, available items in display order, gzip-compressed.
+    Returns None if the restaurant does not exist.
+    """
+    restaurant = db.query(models.Restaurant).filter(models.Restaurant.id == restaurant_id).first()
+    if not restaurant:
+        return None
+    version = restaurant.menu_version or 0
+
+    categories = db.query(models.Category).filter(
+        models.Category.restaurant_id == restaurant_id
+    ).order_by(models.Category.id).all()
+    items = db.query(models.MenuItem).filter(
+        models.MenuItem.restaurant_id == restaurant_id,
+        models.MenuItem.is_active == True,
+        models.MenuItem.is_available == True
+    ).order_by(models.MenuItem.id).all()
+
+    items_by_category: Dict[int, list] = {}
+    for item in items:
+        items_by_category.setdefault(item.category_id, []).append(schemas.MenuItem.model_validate(item))
+
+    document = {
+        "version": version,
+        "restaurant": {
+            "id": restaurant.id,
+            "name": restaurant.name,
+            "address": restaurant.address,
+            "phone": restaurant.phone,
+        },
+        "categories": [
+            {
+                "id": category.id,
+                "name": category.name,
+                "items": items_by_category.get(category.id, []),
+            }
+            for category in categories
+        ],
+    }
+    body = json.dumps(jsonable_encoder(document), separators=(",", ":")).encode()
+    return MenuSnapshot(version, gzip.compress(body, mtime=0))
+
+
+def _store(restaurant_id: int, snapshot: MenuSnapshot) -> None:
+    with _lock:
+        current = _snapshots.get(restaurant_id)
+        if current and current.version > snapshot.version:
+            return
+        _snapshots[restaurant_id] = snapshot
+
+    os.makedirs(settings.MENU_SNAPSHOT_DIR, exist_ok=True)
+    path = _snapshot_path(restaurant_id, snapshot.version)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(snapshot.gzipped)
+    os.replace(tmp_path, path)
+
+    # Drop older versions of this restaurant's snapshot
+    prefix = f"{restaurant_id}-v"
+    for name in os.listdir(settings.MENU_SNAPSHOT_DIR):
+        if name.startswith(prefix) and name.endswith(".json.gz") and name != os.path.basename(path):
+            try:
+                os.remove(os.path.join(settings.MENU_SNAPSHOT_DIR, name))
+            except OSError:
+                pass
+
+
+def _rebuild(restaurant_id: int) -> None:
+    with _lock:
+        # Changes committed from here on need a rebuild of their own
+        _pending.pop(restaurant_id, None)
+    db = SessionLocal()
+    try:
+        snapshot = build_snapshot(db, restaurant_id)
+        if snapshot:
+            _store(restaurant_id, snapshot)
+    except Exception as e:
+        print(f"[ERROR] Failed to rebuild menu snapshot for restaurant {restaurant_id}: {e}")
+    finally:
+        db.close()
+
+
+@on_menu_change
+def schedule_rebuild(restaurant_id: int) -> Future:
+    """
+    Rebuild a restaurant's snapshot in the background; repeated changes
+    while a rebuild is queued collapse into one. Returns its future.
+    """
+    with _lock:
+        future = _pending.get(restaurant_id)
+        if future is None:
+            future = _pending[restaurant_id] = _in_flight[restaurant_id] = _executor.submit(_rebuild, restaurant_id)
+            future.add_done_callback(lambda done: _finished(restaurant_id, done))
+    return future
+
+
+def _finished(restaurant_id: int, future: Future) -> None:
+    with _lock:
+        if _in_flight.get(restaurant_id) is future:
+            del _in_flight[restaurant_id]
+
+
+def get_snapshot(db: Session, restaurant_id: int) -> Optional[MenuSnapshot]:
+    """
+    Current snapshot for a restaurant: from memory, else from disk (possibly
+    written by another worker).
+
+    While a newer version is being rebuilt, requests wait up to
+    MENU_SNAPSHOT_WAIT_SECONDS for it and then keep getting the previous
+    snapshot, so only a cold start builds on the request thread.
+    """
+    version = menu_cache.version(db, restaurant_id)
+    with _lock:
+        snapshot = _snapshots.get(restaurant_id)
+    if snapshot and snapshot.version == version:
+        return snapshot
+
+    try:
+        with open(_snapshot_path(restaurant_id, version), "rb") as f:
+            snapshot = MenuSnapshot(version, f.read())
+        with _lock:
+            _snapshots[restaurant_id] = snapshot
+        return snapshot
+    except FileNotFoundError:
+        pass
+
+    if snapshot is None:
+        # Cold start: nothing to serve in the meantime
+        snapshot = build_snapshot(db, restaurant_id)
+        if snapshot:
+            _store(restaurant_id, snapshot)
+        return snapshot
+
+    # Join the rebuild under way; the change may also have been committed by another worker
+    with _lock:
+        future = _in_flight.get(restaurant_id)
+    wait([future or schedule_rebuild(restaurant_id)], timeout=settings.MENU_SNAPSHOT_WAIT_SECONDS)
+    with _lock:
+        return _snapshots.get(restaurant_id, snapshot)
@@ -1,48 +1,34 @@
-import requests
-from typing import Optional, Dict, Any
+from datetime import datetime
+from typing import Any, Callable, Collection, Dict, Iterable, List, Optional
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from app.models.notification import Notification
-from app.models.user import User
-
-EXPO_PUSH_URL = "https://exp.host/--/api/v2/push/send"
+from app.services.outbox import queue_pushes
+from app.services.push_dispatcher import push_dispatcher
 
 def send_push_notification(
     push_token: str,
     title: str,
     body: str,
-    data: Optional[Dict[str, Any]] = None
+    data: Optional[Dict[str, Any]] = None,
+    on_done: Optional[Callable[[bool], None]] = None
 ) -> bool:
     """
-    Send a push notification via Expo Push Notification service.
+    Queue a push notification for the Expo Push Notification service.
+    It is sent in the background (see push_dispatcher); returns False if the
+    token is invalid or the queue is full.
     """
     if not push_token or not push_token.startswith("ExponentPushToken"):
         print(f"[WARN] Invalid push token: {push_token}")
         return False
 
-    message = {
+    return push_dispatcher.enqueue({
         "to": push_token,
         "sound": "default",
         "title": title,
         "body": body,
         "data": data or {},
-    }
-
-    try:
-        response = requests.post(EXPO_PUSH_URL, json=message, timeout=5)
-        response.raise_for_status()
-        result = response.json()
-        
-        if "data" in result and len(result["data"]) > 0:
-            ticket = result["data"][0]
-            if ticket.get("status") == "error":
-                print(f"[ERROR] Push notification error: {ticket.get('message')}")
-                return False
-        
-        print(f"[INFO] Push notification sent successfully to {push_token[:20]}...")
-        return True
-    except Exception as e:
-        print(f"[ERROR] Failed to send push notification: {str(e)}")
-        return False
+    }, on_done=on_done)
 
 
 def create_notification_record(
@@ -53,7 +39,7 @@ def create_notification_record(
     data: Optional[Dict[str, Any]] = None
 ) -> Notification:
     """
-    Create a notification record in the database.
+    Add a notification record to the current transaction.
     """
     notification = Notification(
         user_id=user_id,
@@ -62,8 +48,6 @@ def create_notification_record(
         data=data
     )
     db.add(notification)
-    db.commit()
-    db.refresh(notification)
     return notification
 
 
@@ -72,19 +56,45 @@ def notify_user(
     user_id: int,
     title: str,
     body: str,
-    data: Optional[Dict[str, Any]] = None
-) -> Notification:
+    data: Optional[Dict[str, Any]] = None,
+    send_push: bool = True
+) -> None:
     """
-    Send push notification and create database record.
+    Notify a single user; see notify_users.
     """
-    # Create database record
-    notification = create_notification_record(db, user_id, title, body, data)
-    
-    # Get user's push token
-    user = db.query(User).filter(User.id == user_id).first()
-    if user and user.push_token:
-        send_push_notification(user.push_token, title, body, data)
-    else:
-        print(f"[WARN] User {user_id} has no push token")
-    
-    return notification
+    notify_users(db, [user_id], title, body, data, skip_push=() if send_push else (user_id,))
+
+
+def notify_users(
+    db: Session,
+    user_ids: Iterable[int],
+    title: str,
+    body: str,
+    data: Optional[Dict[str, Any]] = None,
+    skip_push: Collection[int] = ()
+) -> None:
+    """
+    Send the same notification to several users in the caller's transaction;
+    nothing is committed here. Pushes go out through the outbox once the
+    caller commits. Users in `skip_push` (e.g. already connected in realtime)
+    get the notification record only.
+    """
+    add_notifications(db, [
+        {"user_id": user_id, "title": title, "body": body, "data": data, "send_push": user_id not in skip_push}
+        for user_id in dict.fromkeys(user_ids)
+    ])
+
+
+def add_notifications(db: Session, notifications: List[Dict[str, Any]]) -> None:
+    """
+    Add notifications ({"user_id", "title", "body", "data", "send_push"})
+    with one multi-row INSERT for the records and one for their pushes.
+    """
+    if not notifications:
+        return
+    now = datetime.utcnow()
+    db.execute(insert(Notification).values([
+        {"user_id": n["user_id"], "title": n["title"], "body": n["body"], "data": n.get("data"), "read": False, "created_at": now}
+        for n in notifications
+    ]))
+    queue_pushes(db, [n for n in notifications if n.get("send_push", True)])
@@ -0,0 +1,167 @@
+from typing import Dict, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import and_, case, func, insert, or_, update
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app import models, schemas
+
+
+def next_change_seq(db: Session, restaurant_id: int, count: int = 1) -> int:
+    """
+    Reserve `count` change sequence numbers for a restaurant and return the
+    highest one.
+
+    The counter row stays locked until the caller commits, so sequence
+    numbers become visible in increasing order and the change feed can
+    safely resume from the last number a client has seen.
+    """
+    return db.execute(
+        update(models.Restaurant)
+        .where(models.Restaurant.id == restaurant_id)
+        .values(order_seq=func.coalesce(models.Restaurant.order_seq, 0) + count)
+        .returning(models.Restaurant.order_seq)
+        .execution_options(synchronize_session=False)
+    ).scalar_one()
+
+
+def place_order(
+    db: Session,
+    order_in: schemas.OrderCreate,
+    user_id: int
+) -> models.Order:
+    """
+    Validate and stage a new order in the current transaction.
+
+    The table (with its restaurant) and every referenced menu item are loaded
+    with one query each, and the order and its items are inserted with one
+    statement each. Nothing is committed here; the caller commits exactly once.
+    """
+    table = db.query(models.Table).options(
+        joinedload(models.Table.restaurant)
+    ).filter(
+        models.Table.id == order_in.table_id,
+        models.Table.restaurant_id == order_in.restaurant_id
+    ).first()
+    if not table:
+        raise HTTPException(status_code=404, detail="Table not found")
+    if not order_in.items:
+        # An empty item list would make the bulk INSERT below fall back to DEFAULT VALUES
+        raise HTTPException(status_code=400, detail="Order must contain at least one item")
+
+    item_ids = {item_in.menu_item_id for item_in in order_in.items}
+    menu_items: Dict[int, models.MenuItem] = {
+        menu_item.id: menu_item
+        for menu_item in db.query(models.MenuItem).filter(models.MenuItem.id.in_(item_ids)).all()
+    }
+
+    # Calculate total amount and verify items
+    total_amount = 0
+    order_items = []
+
+    for item_in in order_in.items:
+        menu_item = menu_items.get(item_in.menu_item_id)
+        if not menu_item or menu_item.restaurant_id != order_in.restaurant_id:
+            raise HTTPException(status_code=404, detail=f"Menu item {item_in.menu_item_id} not found")
+        if not menu_item.is_active:
+            raise HTTPException(status_code=400, detail=f"Menu item {menu_item.name} is not available")
+        if item_in.quantity < 1:
+            raise HTTPException(status_code=400, detail=f"Invalid quantity for menu item {menu_item.name}")
+
+        total_amount += menu_item.price * item_in.quantity
+        order_items.append({
+            "menu_item_id": menu_item.id,
+            "quantity": item_in.quantity,
+            "price": menu_item.price
+        })
+
+    order = models.Order(
+        restaurant=table.restaurant,
+        table=table,
+        user_id=user_id,
+        total_amount=total_amount,
+        status="pending",
+        change_seq=next_change_seq(db, order_in.restaurant_id)
+    )
+    db.add(order)
+    db.flush()
+
+    # Unordered RETURNING lets the items go out as a single multi-row INSERT
+    items = db.scalars(
+        insert(models.OrderItem).returning(models.OrderItem),
+        [{"order_id": order.id, **item_data} for item_data in order_items]
+    ).all()
+    set_committed_value(order, "items", sorted(items, key=lambda item: item.id))
+    return order
+
+
+def change_order_status(
+    db: Session,
+    restaurant_id: int,
+    status: str,
+    targets: List[Tuple[int, Optional[int]]]
+) -> list:
+    """
+    Move orders to `status` with one conditional UPDATE (compare-and-swap).
+
+    Each target is (order_id, expected_version). A row only changes if it
+    belongs to the restaurant, its current status may legally move to
+    `status`, and (when given) its version still matches. Returns
+    (id, user_id, table_id, status, version) rows for the orders that changed;
+    requested ids missing from the result were not eligible or lost a race.
+    Nothing is committed here.
+    """
+    if status not in models.ORDER_STATUS_TRANSITIONS:
+        raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
+    allowed_from = [
+        current for current, next_statuses in models.ORDER_STATUS_TRANSITIONS.items()
+        if status in next_statuses
+    ]
+
+    expected_versions = dict(targets)
+    if not expected_versions:
+        return []
+
+    # Every order gets its own change sequence number so the feed never splits a tie
+    last_seq = next_change_seq(db, restaurant_id, len(expected_versions))
+    first_seq = last_seq - len(expected_versions) + 1
+    seq_by_id = {order_id: first_seq + i for i, order_id in enumerate(expected_versions)}
+
+    return db.execute(
+        update(models.Order)
+        .where(
+            models.Order.restaurant_id == restaurant_id,
+            models.Order.status.in_(allowed_from),
+            or_(*[
+                models.Order.id == order_id if version is None
+                else and_(models.Order.id == order_id, models.Order.version == version)
+                for order_id, version in expected_versions.items()
+            ])
+        )
+        .values(
+            status=status,
+            version=models.Order.version + 1,
+            change_seq=case(seq_by_id, value=models.Order.id)
+        )
+        .returning(
+            models.Order.id,
+            models.Order.user_id,
+            models.Order.table_id,
+            models.Order.status,
+            models.Order.version
+        )
+        .execution_options(synchronize_session=False)
+    ).all()
+
+
+def describe_status_conflict(order: models.Order, status: str, expected_version: Optional[int]) -> dict:
+    """
+    Explain why change_order_status skipped an order, for a 409 response.
+    """
+    if status not in models.ORDER_STATUS_TRANSITIONS.get(order.status, set()):
+        message = f"Cannot change order from {order.status} to {status}"
+    elif expected_version is not None and expected_version != order.version:
+        message = "Order was modified by someone else"
+    else:
+        message = "Order was modified concurrently, please retry"
+    return {"id": order.id, "message": message, "status": order.status, "version": order.version}
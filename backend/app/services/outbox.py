@@ -0,0 +1,241 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, event, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models import OutboxEvent, User
+
+PUSH = "push"
+REALTIME = "realtime"
+
+
+def add_outbox_event(db: Session, kind: str, payload: Dict[str, Any]) -> None:
+    """
+    Add an event to the current transaction; the outbox worker delivers it
+    once the transaction commits (and never if it rolls back).
+    """
+    db.add(OutboxEvent(kind=kind, payload=payload))
+    db.info["outbox_pending"] = True
+
+
+def queue_push(db: Session, user_id: int, title: str, body: str, data: Optional[Dict[str, Any]] = None) -> None:
+    queue_pushes(db, [{"user_id": user_id, "title": title, "body": body, "data": data}])
+
+
+def queue_pushes(db: Session, messages: List[Dict[str, Any]]) -> None:
+    """
+    Queue push notifications ({"user_id", "title", "body", "data"}) with one
+    multi-row INSERT; the worker delivers them together as one batch.
+    """
+    if not messages:
+        return
+    db.execute(insert(OutboxEvent).values([
+        {
+            "kind": PUSH,
+            "payload": {"user_id": m["user_id"], "title": m["title"], "body": m["body"], "data": m.get("data") or {}},
+        }
+        for m in messages
+    ]))
+    db.info["outbox_pending"] = True
+
+
+def queue_realtime(db: Session, event_name: str, **kwargs) -> None:
+    """
+    Emit a socket_manager realtime event (see REALTIME_EVENTS) after commit,
+    e.g. queue_realtime(db, "new_order", restaurant_id=1, order_data={...}).
+    """
+    add_outbox_event(db, REALTIME, {"event": event_name, "kwargs": kwargs})
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    if session.info.pop("outbox_pending", False):
+        outbox_worker.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop("outbox_pending", None)
+
+
+class OutboxWorker:
+    """
+    Drains outbox_events on the event loop: push notifications go to the
+    push dispatcher, realtime events to socket_manager.
+
+    Events are claimed in batches with a lease (locked_until), so several
+    workers can drain the same table, and are deleted only once delivered;
+    an event whose worker died, or whose push was given up on, is claimed
+    again when its lease runs out. Delivery is therefore at least once.
+    The worker is woken by commits that added events and also polls every
+    `poll_seconds` for events left behind by other processes.
+    """
+
+    def __init__(self, batch_size: int, lease_seconds: int, poll_seconds: float, max_attempts: int):
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._delivered: List[int] = []
+        self._delivered_lock = threading.Lock()
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self._loop = None
+
+    def wake(self) -> None:
+        # Called from request threads after commit
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                while await self.drain_once():
+                    pass
+                await asyncio.to_thread(self._delete_delivered)
+            except Exception as e:
+                print(f"[ERROR] Outbox worker failed: {e}")
+
+    async def drain_once(self) -> bool:
+        """
+        Claim and deliver one batch; returns False once nothing is left.
+        """
+        events = await asyncio.to_thread(self._claim_batch)
+        if not events:
+            return False
+
+        pushes = [outbox_event for outbox_event in events if outbox_event["kind"] == PUSH]
+        if pushes:
+            await asyncio.to_thread(self._dispatch_pushes, pushes)
+
+        from app.socket_manager import REALTIME_EVENTS
+        for outbox_event in events:
+            if outbox_event["kind"] != REALTIME:
+                continue
+            payload = outbox_event["payload"]
+            notify = REALTIME_EVENTS.get(payload.get("event"))
+            if notify is None:
+                print(f"[ERROR] Unknown realtime event in outbox: {payload.get('event')}")
+            else:
+                try:
+                    await notify(**payload.get("kwargs", {}))
+                except Exception as e:
+                    # Left claimed; retried when the lease runs out
+                    print(f"[ERROR] Realtime event {payload.get('event')} failed: {e}")
+                    continue
+            self._mark_delivered(outbox_event["id"])
+
+        await asyncio.to_thread(self._delete_delivered)
+        return len(events) == self.batch_size
+
+    def _claim_batch(self) -> List[dict]:
+        now = datetime.utcnow()
+        claimable = or_(OutboxEvent.locked_until.is_(None), OutboxEvent.locked_until < now)
+        db = SessionLocal()
+        try:
+            batch_ids = (
+                select(OutboxEvent.id)
+                .where(claimable)
+                .order_by(OutboxEvent.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            rows = db.execute(
+                update(OutboxEvent)
+                .where(OutboxEvent.id.in_(batch_ids), claimable)
+                .values(locked_until=now + timedelta(seconds=self.lease_seconds), attempts=OutboxEvent.attempts + 1)
+                .returning(OutboxEvent.id, OutboxEvent.kind, OutboxEvent.payload, OutboxEvent.attempts)
+                .execution_options(synchronize_session=False)
+            ).all()
+            db.commit()
+        finally:
+            db.close()
+
+        events = []
+        for row in sorted(rows, key=lambda row: row.id):
+            if row.attempts > self.max_attempts:
+                print(f"[ERROR] Dropping outbox event {row.id} ({row.kind}) after {row.attempts - 1} attempts")
+                self._mark_delivered(row.id)
+                continue
+            events.append({"id": row.id, "kind": row.kind, "payload": row.payload})
+        return events
+
+    def _dispatch_pushes(self, pushes: List[dict]) -> None:
+        from app.services.notification_service import send_push_notification
+
+        user_ids = {outbox_event["payload"]["user_id"] for outbox_event in pushes}
+        db = SessionLocal()
+        try:
+            tokens = dict(db.execute(select(User.id, User.push_token).where(User.id.in_(user_ids))).all())
+        finally:
+            db.close()
+
+        for outbox_event in pushes:
+            payload = outbox_event["payload"]
+            token = tokens.get(payload["user_id"])
+            if not token:
+                print(f"[WARN] User {payload['user_id']} has no push token")
+                self._mark_delivered(outbox_event["id"])
+                continue
+            queued = send_push_notification(
+                token, payload["title"], payload["body"], payload.get("data"),
+                on_done=lambda delivered, outbox_id=outbox_event["id"]: self._push_done(outbox_id, delivered),
+            )
+            if not queued and not token.startswith("ExponentPushToken"):
+                # Invalid token: retrying cannot help
+                self._mark_delivered(outbox_event["id"])
+
+    def _push_done(self, outbox_id: int, delivered: bool) -> None:
+        # Dispatcher thread; undelivered events are retried when their lease expires
+        if delivered:
+            self._mark_delivered(outbox_id)
+            self.wake()
+
+    def _mark_delivered(self, outbox_id: int) -> None:
+        with self._delivered_lock:
+            self._delivered.append(outbox_id)
+
+    def _delete_delivered(self) -> None:
+        with self._delivered_lock:
+            delivered, self._delivered = self._delivered, []
+        if not delivered:
+            return
+        db = SessionLocal()
+        try:
+            db.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(delivered)))
+            db.commit()
+        finally:
+            db.close()
+
+
+outbox_worker = OutboxWorker(
+    batch_size=settings.OUTBOX_BATCH_SIZE,
+    lease_seconds=settings.OUTBOX_LEASE_SECONDS,
+    poll_seconds=settings.OUTBOX_POLL_SECONDS,
+    max_attempts=settings.OUTBOX_MAX_ATTEMPTS,
+)
@@ -0,0 +1,85 @@
+import threading
+import time
+from typing import Dict, FrozenSet, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import TimeEntry
+
+
+class PresenceIndex:
+    """
+    Per-worker index of who is on shift (clocked in) at each restaurant and
+    which users have a live Socket.IO connection.
+
+    A restaurant's roster is loaded from open time entries on first use and
+    re-read at most every `recheck_seconds`, so clock-ins handled by other
+    workers are picked up too; clock-ins and clock-outs handled here apply
+    immediately. Lookups between reloads are O(1) and never touch the
+    database.
+    """
+
+    def __init__(self, recheck_seconds: int):
+        self.recheck_seconds = recheck_seconds
+        self._on_shift: Dict[int, Tuple[FrozenSet[int], float]] = {}
+        self._connections: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def on_shift(self, db: Session, restaurant_id: int) -> FrozenSet[int]:
+        """
+        Ids of the employees clocked in at a restaurant.
+        """
+        now = time.monotonic()
+        with self._lock:
+            cached = self._on_shift.get(restaurant_id)
+        if cached and now - cached[1] < self.recheck_seconds:
+            return cached[0]
+
+        employee_ids = frozenset(db.scalars(
+            select(TimeEntry.employee_id).where(
+                TimeEntry.restaurant_id == restaurant_id,
+                TimeEntry.clock_out.is_(None)
+            )
+        ))
+        with self._lock:
+            self._on_shift[restaurant_id] = (employee_ids, now)
+        return employee_ids
+
+    def clock_in(self, restaurant_id: int, employee_id: int) -> None:
+        self._update_shift(restaurant_id, employee_id, True)
+
+    def clock_out(self, restaurant_id: int, employee_id: int) -> None:
+        self._update_shift(restaurant_id, employee_id, False)
+
+    def _update_shift(self, restaurant_id: int, employee_id: int, clocked_in: bool) -> None:
+        with self._lock:
+            cached = self._on_shift.get(restaurant_id)
+            if cached is None:
+                # Not loaded yet; the first lookup reads the committed state
+                return
+            employee_ids = cached[0] | {employee_id} if clocked_in else cached[0] - {employee_id}
+            self._on_shift[restaurant_id] = (employee_ids, cached[1])
+
+    def connected(self, user_id: int) -> None:
+        with self._lock:
+            self._connections[user_id] = self._connections.get(user_id, 0) + 1
+
+    def disconnected(self, user_id: int) -> None:
+        with self._lock:
+            remaining = self._connections.get(user_id, 0) - 1
+            if remaining > 0:
+                self._connections[user_id] = remaining
+            else:
+                self._connections.pop(user_id, None)
+
+    def is_online(self, user_id: int) -> bool:
+        """
+        Whether the user has a Socket.IO connection to this worker (and so
+        already receives realtime events).
+        """
+        return user_id in self._connections
+
+
+presence = PresenceIndex(recheck_seconds=settings.PRESENCE_RECHECK_SECONDS)
@@ -0,0 +1,55 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Iterable, List, Optional
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    # Created on first use; "spawn" so workers never inherit the server's threads or sockets
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.WORKER_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _discard_pool() -> None:
+    # A worker died (e.g. out of memory); the next call starts a fresh pool
+    global _pool
+    with _pool_lock:
+        _pool = None
+
+
+def run_in_process(fn: Callable, *args) -> Any:
+    """
+    Run CPU-bound work (Pillow, QR rendering) in the shared worker pool and
+    wait for the result, so it never holds the API worker's GIL.
+    `fn` must be a module-level function.
+    """
+    try:
+        return _get_pool().submit(fn, *args).result()
+    except BrokenProcessPool:
+        _discard_pool()
+        raise HTTPException(status_code=503, detail="Rendering is temporarily unavailable")
+
+
+def map_in_process(fn: Callable, items: Iterable, chunksize: int = 1) -> List[Any]:
+    """
+    Like run_in_process, but spreads `items` over all pool workers.
+    """
+    try:
+        return list(_get_pool().map(fn, items, chunksize=chunksize))
+    except BrokenProcessPool:
+        _discard_pool()
+        raise HTTPException(status_code=503, detail="Rendering is temporarily unavailable")
@@ -0,0 +1,239 @@
+import queue
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.core.config import settings
+
+# Expo accepts up to 100 messages per request
+EXPO_BATCH_LIMIT = 100
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failed calls and stays open
+    for `reset_seconds`; then a single trial call is let through (half-open)
+    and its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if self.retry_in() == 0 else "open"
+
+    def retry_in(self) -> float:
+        """
+        Seconds until a call may be attempted (0 when closed or half-open).
+        """
+        if self.opened_at is None:
+            return 0
+        return max(0.0, self.opened_at + self.reset_seconds - time.monotonic())
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                self.times_opened += 1
+            self.opened_at = time.monotonic()
+
+
+class PushDispatcher:
+    """
+    Sends Expo push messages from a background thread so request handlers
+    never wait on Expo.
+
+    Queued messages are grouped into batch requests of up to `batch_size`
+    over one keep-alive session. Network errors, 429 and 5xx responses are
+    retried with exponential backoff and jitter, up to `max_retries` times;
+    consecutive failures open a circuit breaker that pauses sending while
+    Expo is down. When the queue is full new messages are refused.
+
+    An `on_done(delivered)` callback passed to enqueue() runs on the
+    dispatcher thread once the message was accepted by Expo (delivered=True,
+    also for per-message errors that resending cannot fix) or given up on.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        batch_size: int = EXPO_BATCH_LIMIT,
+        max_queue: int = 10000,
+        max_retries: int = 5,
+        backoff_seconds: float = 0.5,
+        timeout_seconds: float = 10,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.url = url
+        self.batch_size = min(batch_size, EXPO_BATCH_LIMIT)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.timeout_seconds = timeout_seconds
+        self.breaker = breaker or CircuitBreaker(failure_threshold=5, reset_seconds=30)
+        self._queue: "queue.Queue[Tuple[Dict[str, Any], Optional[Callable[[bool], None]]]]" = queue.Queue(maxsize=max_queue)
+        self._session: Optional[requests.Session] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._counters_lock = threading.Lock()
+        self._counters = {"queued": 0, "dropped": 0, "sent": 0, "failed": 0, "ticket_errors": 0, "requests": 0, "retries": 0}
+
+    def enqueue(self, message: Dict[str, Any], on_done: Optional[Callable[[bool], None]] = None) -> bool:
+        """
+        Queue one Expo message ({"to": ..., "title": ..., ...}); returns
+        False if it was dropped because the queue is full.
+        """
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((message, on_done))
+        except queue.Full:
+            self._count("dropped", 1)
+            print(f"[WARN] Push queue full, dropping notification to {message.get('to', '')[:20]}...")
+            return False
+        self._count("queued", 1)
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued message has been sent or given up on.
+        Returns False if `timeout` ran out first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def stats(self) -> dict:
+        with self._counters_lock:
+            counters = dict(self._counters)
+        return {
+            **counters,
+            "pending": self._queue.qsize(),
+            "breaker": self.breaker.state,
+            "breaker_opened": self.breaker.times_opened,
+        }
+
+    def _count(self, name: str, amount: int) -> None:
+        with self._counters_lock:
+            self._counters[name] += amount
+
+    def _ensure_started(self) -> None:
+        # Started on first use, so importing the app never spawns threads
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2)
+                self._session.mount("https://", adapter)
+                self._session.mount("http://", adapter)
+                self._session.headers.update({"Accept": "application/json", "Accept-Encoding": "gzip, deflate"})
+                self._thread = threading.Thread(target=self._run, name="push-dispatcher", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            delivered = False
+            try:
+                delivered = self._send_batch([message for message, _ in batch])
+            except Exception as e:
+                self._count("failed", len(batch))
+                print(f"[ERROR] Push dispatcher failed on a batch of {len(batch)}: {e}")
+            finally:
+                for _, on_done in batch:
+                    if on_done is not None:
+                        try:
+                            on_done(delivered)
+                        except Exception as e:
+                            print(f"[ERROR] Push completion callback failed: {e}")
+                    self._queue.task_done()
+
+    def _send_batch(self, batch: List[Dict[str, Any]]) -> bool:
+        for attempt in range(self.max_retries + 1):
+            # While the breaker is open, wait for it instead of calling Expo
+            wait = self.breaker.retry_in()
+            if wait:
+                time.sleep(wait)
+
+            if attempt:
+                self._count("retries", 1)
+            error = self._post(batch)
+            if error is None:
+                self.breaker.record_success()
+                return True
+            self.breaker.record_failure()
+            if attempt < self.max_retries:
+                delay = self.backoff_seconds * (2 ** attempt)
+                print(f"[WARN] Push batch of {len(batch)} failed ({error}), retrying in {delay:.1f}s")
+                time.sleep(delay * random.uniform(0.5, 1.5))
+
+        self._count("failed", len(batch))
+        print(f"[ERROR] Giving up on a push batch of {len(batch)} after {self.max_retries + 1} attempts")
+        return False
+
+    def _post(self, batch: List[Dict[str, Any]]) -> Optional[str]:
+        """
+        Send one batch request; returns None on success (including per-message
+        errors, which are not retried) or a description of a retryable failure.
+        """
+        self._count("requests", 1)
+        try:
+            response = self._session.post(self.url, json=batch, timeout=self.timeout_seconds)
+        except requests.RequestException as e:
+            return str(e)
+        if response.status_code == 429 or response.status_code >= 500:
+            return f"HTTP {response.status_code}"
+        if response.status_code >= 400:
+            # The request itself is invalid; resending it would fail the same way
+            self._count("failed", len(batch))
+            print(f"[ERROR] Expo rejected a push batch of {len(batch)}: HTTP {response.status_code} {response.text[:200]}")
+            return None
+
+        try:
+            tickets = response.json().get("data") or []
+        except ValueError:
+            tickets = []
+        errors = 0
+        for message, ticket in zip(batch, tickets):
+            if ticket.get("status") == "error":
+                errors += 1
+                print(f"[ERROR] Push notification error for {message.get('to', '')[:20]}...: {ticket.get('message')}")
+        self._count("ticket_errors", errors)
+        self._count("sent", len(batch) - errors)
+        return None
+
+
+push_dispatcher = PushDispatcher(
+    url=settings.EXPO_PUSH_URL,
+    batch_size=settings.PUSH_BATCH_SIZE,
+    max_queue=settings.PUSH_QUEUE_SIZE,
+    max_retries=settings.PUSH_MAX_RETRIES,
+    backoff_seconds=settings.PUSH_BACKOFF_SECONDS,
+    timeout_seconds=settings.PUSH_TIMEOUT_SECONDS,
+    breaker=CircuitBreaker(
+        failure_threshold=settings.PUSH_BREAKER_THRESHOLD,
+        reset_seconds=settings.PUSH_BREAKER_RESET_SECONDS,
+    ),
+)
@@ -0,0 +1,107 @@
+import io
+import os
+from functools import lru_cache
+from typing import List, Tuple
+
+from app.core.config import settings
+from app.services.process_pool import map_in_process, run_in_process
+from app.utils.qr import render_qr, table_qr_data
+
+# Bump when the encoded payload or rendering changes, to invalidate cached codes
+QR_VERSION = 1
+
+# Print sheet layout: A4 at 150 dpi, 3 x 4 codes per page
+_SHEET_DPI = 150
+_PAGE_SIZE = (1240, 1754)
+_GRID = (3, 4)
+
+
+def _cache_path(restaurant_id: int, table_id: int, format: str) -> str:
+    return os.path.join(settings.QR_CACHE_DIR, f"v{QR_VERSION}-{restaurant_id}-{table_id}.{format}")
+
+
+def _render_to_cache(args: Tuple[int, int, str, str]) -> bytes:
+    # Pool worker: render one code and store it at `path` in the shared disk cache
+    restaurant_id, table_id, format, path = args
+    image = render_qr(table_qr_data(restaurant_id, table_id), format)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(image)
+    os.replace(tmp_path, path)
+    return image
+
+
+@lru_cache(maxsize=settings.QR_CACHE_MAX_ENTRIES)
+def get_table_qr(restaurant_id: int, table_id: int, format: str) -> bytes:
+    """
+    QR code image for a table, rendered on first use and then served from
+    memory, or from QR_CACHE_DIR (shared by all workers) after a restart.
+    The code only depends on the ids, so entries never go stale.
+    """
+    try:
+        with open(_cache_path(restaurant_id, table_id, format), "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        path = _cache_path(restaurant_id, table_id, format)
+        return run_in_process(_render_to_cache, (restaurant_id, table_id, format, path))
+
+
+def render_qr_sheet(restaurant_name: str, tables: List[Tuple[str, bytes]]) -> bytes:
+    """
+    Lay out (table_number, png) codes on A4 pages with a label under
+    each and return the pages as one PDF. Runs inside the process pool.
+    """
+    from PIL import Image, ImageDraw, ImageFont
+
+    columns, rows = _GRID
+    cell_width, cell_height = _PAGE_SIZE[0] // columns, (_PAGE_SIZE[1] - 120) // rows
+    code_size = min(cell_width, cell_height) - 90
+    title_font = ImageFont.load_default(size=36)
+    label_font = ImageFont.load_default(size=28)
+
+    pages = []
+    per_page = columns * rows
+    for start in range(0, max(len(tables), 1), per_page):
+        page = Image.new("L", _PAGE_SIZE, "white")
+        draw = ImageDraw.Draw(page)
+        draw.text((_PAGE_SIZE[0] // 2, 60), restaurant_name, fill="black", font=title_font, anchor="mm")
+        for index, (table_number, png) in enumerate(tables[start:start + per_page]):
+            column, row = index % columns, index // columns
+            left, top = column * cell_width, 120 + row * cell_height
+            code = Image.open(io.BytesIO(png)).convert("L").resize((code_size, code_size), Image.Resampling.NEAREST)
+            page.paste(code, (left + (cell_width - code_size) // 2, top + 10))
+            draw.text(
+                (left + cell_width // 2, top + code_size + 45),
+                f"Table {table_number}", fill="black", font=label_font, anchor="mm"
+            )
+        # Bilevel pages are stored losslessly (CCITT) instead of as JPEG
+        pages.append(page.convert("1", dither=Image.Dither.NONE))
+
+    buffered = io.BytesIO()
+    pages[0].save(buffered, format="PDF", save_all=True, append_images=pages[1:], resolution=_SHEET_DPI)
+    return buffered.getvalue()
+
+
+def build_qr_sheet(restaurant_id: int, restaurant_name: str, tables: List[Tuple[int, str]]) -> bytes:
+    """
+    Print sheet (PDF) with the QR code of every (table_id, table_number).
+    Codes not cached yet are rendered across all pool workers at once.
+    """
+    missing = [
+        table_id for table_id, _ in tables
+        if not os.path.exists(_cache_path(restaurant_id, table_id, "png"))
+    ]
+    if missing:
+        map_in_process(
+            _render_to_cache,
+            [(restaurant_id, table_id, "png", _cache_path(restaurant_id, table_id, "png")) for table_id in missing],
+            chunksize=max(1, len(missing) // (settings.WORKER_PROCESSES * 4)),
+        )
+
+    codes = [
+        (table_number, get_table_qr(restaurant_id, table_id, "png"))
+        for table_id, table_number in tables
+    ]
+    return run_in_process(render_qr_sheet, restaurant_name, codes)
+
@@ -0,0 +1,80 @@
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+
+class RoomHistory:
+    """
+    Recent Socket.IO frames per room, so a reconnecting client can be sent
+    just the frames it missed instead of reloading everything.
+
+    Every frame gets the next number of one monotonic sequence (shared by all
+    rooms, so a frame sent to several rooms has a single number) and is kept
+    in a bounded ring buffer per room. `epoch` changes whenever this worker
+    restarts; sequence numbers are only comparable within one epoch.
+
+    Each worker numbers the frames it emits itself, so replay is exact with a
+    single worker; a client whose epoch belongs to another worker is told to
+    resync.
+    """
+
+    def __init__(self, max_events: int, max_rooms: int):
+        self.max_events = max_events
+        self.max_rooms = max_rooms
+        self.epoch = uuid.uuid4().hex[:12]
+        self.seq = 0
+        self._rooms: "OrderedDict[str, Deque[Tuple[int, str, Any]]]" = OrderedDict()
+        # Highest sequence number evicted from each room's buffer, and from rooms dropped altogether
+        self._dropped_through: Dict[str, int] = {}
+        self._forgotten_through = 0
+
+    def record(self, rooms: Sequence[str], event: str, data: Any) -> Tuple[int, Any]:
+        """
+        Number a frame about to be sent to `rooms`, store it, and return
+        (seq, data) with `seq` and `epoch` added to dict payloads.
+        """
+        self.seq += 1
+        if isinstance(data, dict):
+            data = {**data, "seq": self.seq, "epoch": self.epoch}
+        for room in rooms:
+            buffer = self._rooms.get(room)
+            if buffer is None:
+                buffer = self._rooms[room] = deque()
+                self._forget_rooms()
+            else:
+                self._rooms.move_to_end(room)
+            if len(buffer) >= self.max_events:
+                self._dropped_through[room] = buffer.popleft()[0]
+            buffer.append((self.seq, event, data))
+        return self.seq, data
+
+    def since(self, rooms: Sequence[str], epoch: Optional[str], seq: int) -> Optional[List[dict]]:
+        """
+        Frames sent to any of `rooms` after `seq`, oldest first and each
+        once, or None when some of them are no longer buffered (or `epoch` is
+        not this worker's) and the client has to resync.
+        """
+        if epoch != self.epoch or seq > self.seq:
+            return None
+        frames = {}
+        for room in rooms:
+            buffer = self._rooms.get(room)
+            if buffer is None:
+                if seq < self._forgotten_through:
+                    return None
+                continue
+            if seq < self._dropped_through.get(room, 0):
+                return None
+            for frame_seq, event, data in reversed(buffer):
+                if frame_seq <= seq:
+                    break
+                frames[frame_seq] = {"event": event, "data": data}
+        return [frames[frame_seq] for frame_seq in sorted(frames)]
+
+    def _forget_rooms(self) -> None:
+        # Least recently used rooms go first; anyone behind their last frame must resync
+        while len(self._rooms) > self.max_rooms:
+            room, buffer = self._rooms.popitem(last=False)
+            self._dropped_through.pop(room, None)
+            if buffer:
+                self._forgotten_through = max(self._forgotten_through, buffer[-1][0])
@@ -0,0 +1,122 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from jose import jwt, JWTError
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models import Restaurant, User
+
+
+class SocketAuthError(Exception):
+    pass
+
+
+class SocketIdentity:
+    """
+    Who a Socket.IO connection belongs to, resolved once at connect time and
+    kept in the socket session so later events never touch the database.
+    """
+    __slots__ = ("user_id", "role", "restaurant_ids")
+
+    def __init__(self, user_id: int, role: str, restaurant_ids: Tuple[int, ...]):
+        self.user_id = user_id
+        self.role = role
+        self.restaurant_ids = restaurant_ids
+
+    def rooms(self) -> list:
+        return [f"user_{self.user_id}"] + [f"restaurant_{restaurant_id}" for restaurant_id in self.restaurant_ids]
+
+
+def can_join(identity: Optional[SocketIdentity], room: str) -> bool:
+    """
+    Table rooms are open to anyone holding the table's QR code; user and
+    restaurant rooms only to the identity they belong to.
+    """
+    kind, _, room_id = room.partition("_")
+    if not room_id.isdigit():
+        return False
+    if kind == "table":
+        return True
+    if identity is None:
+        return False
+    if kind == "user":
+        return int(room_id) == identity.user_id
+    if kind == "restaurant":
+        return int(room_id) in identity.restaurant_ids
+    return False
+
+
+class SocketAuthCache:
+    """
+    Bounded per-worker cache of verified access tokens.
+
+    Reconnecting clients (mobile apps resuming, flaky networks) present the
+    same token again and again; a hit skips the JWT decode and the user
+    lookup. Entries expire after `ttl_seconds` or when the token does, so a
+    deactivated user or changed role is picked up within `ttl_seconds`.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[SocketIdentity, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def authenticate(self, token: str) -> SocketIdentity:
+        """
+        Identity for an access token. Raises SocketAuthError for an invalid
+        or expired token and for unknown or inactive users.
+        """
+        now = time.monotonic()
+        with self._lock:
+            cached = self._entries.get(token)
+            if cached and cached[1] > now:
+                self._entries.move_to_end(token)
+                return cached[0]
+
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+            user_id = int(payload["sub"])
+        except (JWTError, KeyError, TypeError, ValueError):
+            raise SocketAuthError("Could not validate credentials")
+
+        identity = load_identity(user_id)
+        expires_at = now + self.ttl_seconds
+        if isinstance(payload.get("exp"), (int, float)):
+            expires_at = min(expires_at, now + payload["exp"] - time.time())
+
+        with self._lock:
+            self._entries[token] = (identity, expires_at)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return identity
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def load_identity(user_id: int) -> SocketIdentity:
+    db = SessionLocal()
+    try:
+        user = db.query(User.id, User.role, User.restaurant_id, User.is_active).filter(User.id == user_id).first()
+        if not user or not user.is_active:
+            raise SocketAuthError("User not found")
+        restaurant_ids = ()
+        if user.role == "owner":
+            restaurant_ids = tuple(row.id for row in db.query(Restaurant.id).filter(Restaurant.owner_id == user.id))
+        elif user.role == "employee" and user.restaurant_id:
+            restaurant_ids = (user.restaurant_id,)
+    finally:
+        db.close()
+    return SocketIdentity(user.id, user.role, restaurant_ids)
+
+
+socket_auth_cache = SocketAuthCache(
+    max_entries=settings.SOCKETIO_AUTH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.SOCKETIO_AUTH_CACHE_SECONDS,
+)
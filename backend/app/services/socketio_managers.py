@@ -0,0 +1,166 @@
+import asyncio
+import threading
+from typing import Awaitable, Callable, Optional
+from urllib.parse import urlparse
+
+import socketio
+from socketio.async_pubsub_manager import AsyncPubSubManager
+
+try:
+    import psycopg2
+    from psycopg2 import sql
+except ImportError:  # pragma: no cover
+    psycopg2 = None
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+PG_NOTIFY_MAX_BYTES = 7999
+
+# Called with (event, data, room) for every emit delivered by this worker
+DeliveryListener = Callable[[str, object, object], Awaitable[None]]
+
+
+class _DeliveryHook:
+    """
+    Lets other transports (e.g. Server-Sent Events) see every emit this
+    worker delivers to its own clients, including emits published by other
+    workers through a pub/sub manager.
+    """
+    on_deliver: Optional[DeliveryListener] = None
+
+    async def _delivered(self, event, data, namespace, room) -> None:
+        if self.on_deliver is None or room is None or (namespace or "/") != "/":
+            return
+        try:
+            await self.on_deliver(event, data, room)
+        except Exception as e:
+            print(f"[ERROR] Delivery listener failed for '{event}': {e}")
+
+
+class LocalManager(_DeliveryHook, socketio.AsyncManager):
+    async def emit(self, event, data, namespace, room=None, skip_sid=None, callback=None, to=None, **kwargs):
+        await super().emit(event, data, namespace, room=room, skip_sid=skip_sid, callback=callback, to=to, **kwargs)
+        await self._delivered(event, data, namespace, to or room)
+
+
+class _PubSubDeliveryHook(_DeliveryHook):
+    async def _handle_emit(self, message):
+        await super()._handle_emit(message)
+        data = message["data"]
+        if isinstance(data, list) and len(data) == 1 and not message.get("binary"):
+            await self._delivered(message["event"], data[0], message.get("namespace"), message.get("room"))
+
+
+class RedisManager(_PubSubDeliveryHook, socketio.AsyncRedisManager):
+    pass
+
+
+class PostgresNotifyManager(_PubSubDeliveryHook, AsyncPubSubManager):
+    """
+    Socket.IO client manager that shares emits between workers through
+    Postgres LISTEN / NOTIFY, for deployments that have Postgres but no Redis.
+
+    Each server keeps one connection LISTENing on the channel, driven by the
+    event loop (no polling thread), and publishes with pg_notify() from a
+    worker thread. Messages larger than PG_NOTIFY_MAX_BYTES cannot be sent.
+    """
+    name = "postgres-notify"
+
+    def __init__(self, url: str, channel: str = "socketio", write_only: bool = False, logger=None, json=None):
+        if psycopg2 is None:
+            raise RuntimeError('psycopg2 is not installed (Run "pip install psycopg2-binary")')
+        super().__init__(channel=channel, write_only=write_only, logger=logger, json=json)
+        self.url = url
+        self._publish_conn = None
+        self._publish_lock = threading.Lock()
+
+    def _connect(self):
+        conn = psycopg2.connect(self.url)
+        conn.autocommit = True
+        return conn
+
+    def _notify(self, payload: str) -> None:
+        with self._publish_lock:
+            for retries_left in range(1, -1, -1):  # 2 attempts
+                try:
+                    if self._publish_conn is None or self._publish_conn.closed:
+                        self._publish_conn = self._connect()
+                    with self._publish_conn.cursor() as cursor:
+                        cursor.execute("SELECT pg_notify(%s, %s)", (self.channel, payload))
+                    return
+                except psycopg2.Error as exc:
+                    self._publish_conn = None
+                    if retries_left == 0:
+                        raise exc
+
+    async def _publish(self, data):
+        payload = self.json.dumps(data)
+        if len(payload.encode()) > PG_NOTIFY_MAX_BYTES:
+            self._get_logger().error(
+                f"Socket.IO message of {len(payload)} bytes is too large for NOTIFY, not sent to other workers"
+            )
+            return
+        try:
+            await asyncio.to_thread(self._notify, payload)
+        except psycopg2.Error as exc:
+            self._get_logger().error(f"Cannot publish to postgres... giving up: {exc}")
+
+    async def _listen(self):
+        loop = asyncio.get_running_loop()
+        retry_sleep = 1
+        while True:
+            conn = None
+            try:
+                conn = await asyncio.to_thread(self._connect)
+                with conn.cursor() as cursor:
+                    cursor.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+                retry_sleep = 1
+
+                readable = asyncio.Event()
+                loop.add_reader(conn.fileno(), readable.set)
+                try:
+                    while True:
+                        await readable.wait()
+                        readable.clear()
+                        conn.poll()
+                        while conn.notifies:
+                            notify = conn.notifies.pop(0)
+                            if notify.channel == self.channel:
+                                yield notify.payload
+                finally:
+                    loop.remove_reader(conn.fileno())
+            except psycopg2.Error as exc:
+                self._get_logger().error(f"Cannot receive from postgres... retrying in {retry_sleep} secs: {exc}")
+                await asyncio.sleep(retry_sleep)
+                retry_sleep = min(retry_sleep * 2, 60)
+            finally:
+                if conn is not None and not conn.closed:
+                    conn.close()
+
+
+def create_client_manager(
+    url: Optional[str],
+    channel: str = "socketio",
+    write_only: bool = False,
+    on_deliver: Optional[DeliveryListener] = None,
+):
+    """
+    Socket.IO client manager for SOCKETIO_MANAGER_URL:
+
+    - empty: in-process (single worker only)
+    - redis://, rediss://, valkey://, unix://: Redis pub/sub (needs the redis package)
+    - postgresql://, postgres://: Postgres LISTEN / NOTIFY
+
+    `on_deliver` is awaited with (event, data, room) for every room emit this
+    worker delivers.
+    """
+    scheme = urlparse(url).scheme.split("+", 1)[0].lower() if url else ""
+    if not url:
+        manager = LocalManager()
+    elif scheme in ("redis", "rediss", "valkey", "valkeys", "unix"):
+        manager = RedisManager(url, channel=channel, write_only=write_only)
+    elif scheme in ("postgresql", "postgres"):
+        manager = PostgresNotifyManager(url, channel=channel, write_only=write_only)
+    else:
+        raise ValueError(f"Unsupported SOCKETIO_MANAGER_URL scheme: {scheme}")
+    manager.on_deliver = on_deliver
+    return manager
@@ -1,40 +1,147 @@
+import asyncio
+from typing import Optional
+from urllib.parse import parse_qs
+
 import socketio
 
-# Create a Socket.IO server
-sio = socketio.AsyncServer(async_mode='asgi', cors_allowed_origins='*')
+from app.core.config import settings
+from app.services.emit_scheduler import EmitScheduler
+from app.services.event_stream import EventBroker
+from app.services.presence import presence
+from app.services.room_history import RoomHistory
+from app.services.socket_auth import SocketAuthError, can_join, socket_auth_cache
+from app.services.socketio_managers import create_client_manager
+
+# Server-Sent Events subscribers (see api/endpoints/events.py) get every room emit delivered here
+broker = EventBroker(settings.SSE_QUEUE_SIZE)
+
+# Create a Socket.IO server. With more than one worker, SOCKETIO_MANAGER_URL
+# points every worker at a shared Redis or Postgres so emits reach all clients.
+sio = socketio.AsyncServer(
+    async_mode='asgi',
+    cors_allowed_origins='*',
+    client_manager=create_client_manager(
+        settings.SOCKETIO_MANAGER_URL, settings.SOCKETIO_CHANNEL, on_deliver=broker.publish
+    ),
+)
 
 # Wrap with ASGI application
 app = socketio.ASGIApp(sio)
 
+# Notifications below are buffered per room for SOCKETIO_EMIT_WINDOW_MS and sent as one frame,
+# numbered and kept per room so reconnecting clients can resume where they left off
+history = RoomHistory(settings.SOCKETIO_HISTORY_MAX_EVENTS, settings.SOCKETIO_HISTORY_MAX_ROOMS)
+emitter = EmitScheduler(sio, settings.SOCKETIO_EMIT_WINDOW_MS / 1000, history=history)
+
+def _connect_param(auth, environ, name: str) -> Optional[str]:
+    # Clients send {"token": ..., "table_id": ...} as Socket.IO auth, or as query parameters
+    if isinstance(auth, dict) and auth.get(name) is not None:
+        return str(auth[name])
+    values = parse_qs(environ.get("QUERY_STRING", "")).get(name)
+    return values[0] if values else None
+
 @sio.event
-async def connect(sid, environ):
-    print(f"Client connected: {sid}")
+async def connect(sid, environ, auth=None):
+    """
+    Join the client to its rooms: with an access token, `user_{id}` and the
+    restaurants it owns or works at; with a table_id (scanned QR code), `table_{id}`.
+    Anonymous connections are still accepted for table rooms.
+
+    The token is verified once here and the identity kept in the socket
+    session; later events are authorized against it without the database.
+    """
+    identity = None
+    token = _connect_param(auth, environ, "token")
+    if token:
+        try:
+            identity = await asyncio.to_thread(socket_auth_cache.authenticate, token)
+        except SocketAuthError as exc:
+            raise socketio.exceptions.ConnectionRefusedError(str(exc))
+    await sio.save_session(sid, {"identity": identity})
+
+    rooms = identity.rooms() if identity else []
+    table_id = _connect_param(auth, environ, "table_id")
+    if table_id:
+        if not table_id.isdigit():
+            raise socketio.exceptions.ConnectionRefusedError("Invalid table_id")
+        rooms.append(f"table_{table_id}")
+
+    for room in rooms:
+        await sio.enter_room(sid, room)
+    # Only once nothing can refuse the connection: a refused one never gets a disconnect
+    if identity:
+        presence.connected(identity.user_id)
+    print(f"Client connected: {sid} rooms={rooms}")
 
 @sio.event
-async def disconnect(sid):
+async def disconnect(sid, reason=None):
+    session = await sio.get_session(sid)
+    if session.get("identity"):
+        presence.disconnected(session["identity"].user_id)
     print(f"Client disconnected: {sid}")
 
 @sio.event
 async def join_room(sid, room):
     """
-    Allow clients to join a specific room (e.g., 'restaurant_1')
-    to receive updates for that context.
+    Allow clients to join a specific room (e.g., 'table_3', or 'restaurant_1'
+    for its staff) to receive updates for that context. Acks True or False.
     """
+    session = await sio.get_session(sid)
+    if not isinstance(room, str) or not can_join(session.get("identity"), room):
+        print(f"[WARN] Client {sid} not allowed to join room: {room}")
+        return False
     print(f"Client {sid} joining room: {room}")
-    sio.enter_room(sid, room)
+    await sio.enter_room(sid, room)
+    return True
+
+@sio.event
+async def resume(sid, data):
+    """
+    Sent by a reconnected client, after its rooms are joined, with the
+    `epoch` and `seq` of the last frame it received. Acks the frames it
+    missed in its rooms, or resync=True when they are no longer all buffered
+    and it has to reload its state.
+    """
+    try:
+        epoch, seq = data.get("epoch"), int(data.get("seq"))
+    except (AttributeError, TypeError, ValueError):
+        return {"error": "Expected {\"epoch\": ..., \"seq\": ...}"}
+    rooms = [room for room in sio.rooms(sid) if room != sid]
+    frames = history.since(rooms, epoch, seq)
+    if frames is None:
+        return {"epoch": history.epoch, "seq": history.seq, "resync": True}
+    return {"epoch": history.epoch, "seq": history.seq, "resync": False, "frames": frames}
 
 async def notify_new_order(restaurant_id, order_data):
     """
     Emit a 'new_order' event to the specific restaurant room.
     """
-    await sio.emit('new_order', order_data, room=f'restaurant_{restaurant_id}')
+    await emitter.emit('new_order', order_data, f'restaurant_{restaurant_id}')
 
-async def notify_order_update(order_id, status, customer_id=None):
+async def notify_service_request(restaurant_id, request_data):
     """
-    Emit an 'order_update' event.
-    If customer_id is provided, we could target a specific user room,
-    but for now we'll broadcast to the restaurant room or a global updates channel.
+    Emit a 'service_request' event (call waiter / bill) to the restaurant room.
     """
-    # For simplicity, we might just broadcast to the restaurant room for now
-    # In a real app, we'd have user-specific rooms.
-    pass
+    await emitter.emit('service_request', request_data, f'restaurant_{restaurant_id}')
+
+async def notify_order_update(restaurant_id, order_data, customer_id=None, table_id=None):
+    """
+    Emit an 'order_update' event to the restaurant room and, when known, to
+    the customer's user room and the table room (which receive it once between
+    them). A newer update for the same order in the same window replaces it.
+    """
+    key = ('order_update', order_data.get('id'))
+    await emitter.emit('order_update', order_data, f'restaurant_{restaurant_id}', key=key)
+    customer_rooms = tuple(room for room in (
+        f'user_{customer_id}' if customer_id else None,
+        f'table_{table_id}' if table_id else None,
+    ) if room)
+    if customer_rooms:
+        await emitter.emit('order_update', order_data, customer_rooms, key=key)
+
+# Realtime events that can be queued through the outbox (services/outbox.queue_realtime)
+REALTIME_EVENTS = {
+    'new_order': notify_new_order,
+    'service_request': notify_service_request,
+    'order_update': notify_order_update,
+}
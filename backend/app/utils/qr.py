@@ -1,8 +1,17 @@
 import qrcode
+import qrcode.image.svg
 import io
-import base64
 
-def generate_qr_code(data: str) -> str:
+QR_MEDIA_TYPES = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+}
+
+def table_qr_data(restaurant_id: int, table_id: int) -> str:
+    # Format: https://<domain>/scan?restaurant_id=1&table_id=1
+    return f"restaurant_id={restaurant_id}&table_id={table_id}"
+
+def _make_qr(data: str) -> qrcode.QRCode:
     qr = qrcode.QRCode(
         version=1,
         error_correction=qrcode.constants.ERROR_CORRECT_L,
@@ -11,11 +20,18 @@ def generate_qr_code(data: str) -> str:
     )
     qr.add_data(data)
     qr.make(fit=True)
+    return qr
+
+def render_qr(data: str, format: str = "png") -> bytes:
+    """
+    Render `data` as a QR code image: "png" or "svg" (a single path, scales to any print size).
+    """
+    qr = _make_qr(data)
+    if format == "svg":
+        img = qr.make_image(image_factory=qrcode.image.svg.SvgPathImage)
+    else:
+        img = qr.make_image(fill_color="black", back_color="white")
 
-    img = qr.make_image(fill_color="black", back_color="white")
-    
     buffered = io.BytesIO()
-    img.save(buffered, format="PNG")
-    img_str = base64.b64encode(buffered.getvalue()).decode()
-    
-    return f"data:image/png;base64,{img_str}"
+    img.save(buffered)
+    return buffered.getvalue()
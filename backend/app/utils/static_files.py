@@ -0,0 +1,114 @@
+import os
+import re
+import stat
+import threading
+from mimetypes import guess_type
+from typing import Dict, List
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+# "<sha256>.<ext>" or "<sha256>-<variant>.<ext>": the name changes whenever the content does
+CONTENT_HASHED_NAME = re.compile(r"^[0-9a-f]{64}(?:-[a-z0-9]+)?\.[a-z0-9]+$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Precompressed siblings tried in order of preference, e.g. menu.json.br
+PRECOMPRESSED = [("br", ".br"), ("gzip", ".gz")]
+
+
+class AssetStats:
+    """
+    Per-asset counters for responses sent by ImmutableStaticFiles: requests
+    served, how many of them were 304s, and bytes sent (whole-file sizes,
+    including for range requests).
+    """
+
+    def __init__(self):
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, path: str, sent_bytes: int, not_modified: bool = False) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(path, {"hits": 0, "not_modified": 0, "bytes": 0})
+            counters["hits"] += 1
+            counters["not_modified"] += int(not_modified)
+            counters["bytes"] += sent_bytes
+
+    def snapshot(self) -> List[dict]:
+        with self._lock:
+            return [{"path": path, **counters} for path, counters in self._counters.items()]
+
+
+asset_stats = AssetStats()
+
+
+def _accepts(accept_encoding: str, encoding: str) -> bool:
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip().lower() == encoding:
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """
+    StaticFiles for content-addressed assets.
+
+    Files named by content hash are sent with a one-year immutable
+    Cache-Control and a strong ETag derived from the name, so browsers never
+    revalidate them. Other files must be revalidated on every use. A `.br` or
+    `.gz` sibling is served instead of the file when the client accepts that
+    encoding. Range requests are handled by FileResponse.
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] in ("GET", "HEAD"):
+            accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+            for encoding, suffix in PRECOMPRESSED:
+                if not _accepts(accept_encoding, encoding):
+                    continue
+                try:
+                    full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+                except (OSError, ValueError):
+                    continue
+                if stat_result and stat.S_ISREG(stat_result.st_mode):
+                    return self.file_response(full_path, stat_result, scope, content_encoding=encoding)
+        return await super().get_response(path, scope)
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+        content_encoding: str = None,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        name = os.path.basename(full_path)
+        if content_encoding:
+            name = os.path.splitext(name)[0]
+
+        headers = {"vary": "Accept-Encoding"}
+        if content_encoding:
+            headers["content-encoding"] = content_encoding
+        if CONTENT_HASHED_NAME.match(name):
+            headers["cache-control"] = IMMUTABLE_CACHE_CONTROL
+            headers["etag"] = f'"{name}{"." + content_encoding if content_encoding else ""}"'
+        else:
+            headers["cache-control"] = "no-cache"
+
+        response = FileResponse(
+            full_path,
+            status_code=status_code,
+            headers=headers,
+            media_type=guess_type(name)[0] or "application/octet-stream",
+            stat_result=stat_result,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            asset_stats.record(scope["path"], 0, not_modified=True)
+            return NotModifiedResponse(response.headers)
+        asset_stats.record(scope["path"], 0 if scope["method"] == "HEAD" else stat_result.st_size)
+        return response
@@ -0,0 +1,107 @@
+"""
+Benchmark menu search: the FTS5 index from services.menu_search versus
+ILIKE substring scans.
+
+Seeds a throwaway SQLite file with one restaurant holding --items menu items
+and prints the mean / p95 latency of each backend for a handful of queries.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_menu_search [--items 20000] [--runs 50]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.db.base import Base
+from app.services import menu_search
+
+ADJECTIVES = ["spicy", "grilled", "crispy", "smoked", "fresh", "roasted", "sweet", "creamy", "garlic", "lemon"]
+MAINS = ["chicken", "salmon", "tofu", "beef", "noodles", "burger", "salad", "curry", "risotto", "sandwich"]
+EXTRAS = ["with rice", "and fries", "on sourdough", "with herbs", "in broth", "with slaw", "and greens", "with chili oil"]
+CATEGORIES = ["Starters", "Mains", "Grill", "Vegetarian", "Desserts", "Drinks", "Specials", "Kids"]
+QUERIES = ["chick", "spicy chicken", "salmon rice", "desserts", "12345", "xyz"]
+
+
+def seed(SessionLocal, item_count):
+    rng = random.Random(42)
+    db = SessionLocal()
+    owner = models.User(email="owner@bench.local", password_hash="x", role="owner")
+    db.add(owner)
+    db.flush()
+    restaurant = models.Restaurant(owner_id=owner.id, name="Bench Bistro")
+    db.add(restaurant)
+    db.flush()
+    categories = [models.Category(restaurant_id=restaurant.id, name=name) for name in CATEGORIES]
+    db.add_all(categories)
+    db.flush()
+    db.execute(models.MenuItem.__table__.insert(), [
+        {
+            "restaurant_id": restaurant.id,
+            "category_id": rng.choice(categories).id,
+            "name": f"{rng.choice(ADJECTIVES).title()} {rng.choice(MAINS).title()} #{i}",
+            "description": f"{rng.choice(ADJECTIVES)} {rng.choice(MAINS)} {rng.choice(EXTRAS)}",
+            "price": Decimal("9.50"),
+            "is_active": True,
+            "is_available": True,
+        }
+        for i in range(item_count)
+    ])
+    db.commit()
+    restaurant_id = restaurant.id
+    db.close()
+    return restaurant_id
+
+
+def run(label, search, SessionLocal, restaurant_id, query, runs):
+    tokens = menu_search.search_tokens(query)
+    db = SessionLocal()
+    hits = len(search(db, restaurant_id, tokens, 20))
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        search(db, restaurant_id, tokens, 20)
+        timings.append((time.perf_counter() - start) * 1000)
+    db.close()
+    p95 = statistics.quantiles(timings, n=20)[-1]
+    print(f"  {label:<6} {statistics.mean(timings):>8.2f} ms mean  {p95:>8.2f} ms p95  {hits:>3} hits")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=20000, help="menu items to seed")
+    parser.add_argument("--runs", type=int, default=50, help="searches timed per query")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        if menu_search.ensure_search_index(engine) != "fts5":
+            sys.exit("SQLite was built without FTS5")
+
+        start = time.perf_counter()
+        restaurant_id = seed(SessionLocal, args.items)
+        print(f"Seeded {args.items} items (index maintained by triggers) in {time.perf_counter() - start:.1f}s")
+
+        for query in QUERIES:
+            print(f"q={query!r}:")
+            run("fts5", menu_search._fts5_search, SessionLocal, restaurant_id, query, args.runs)
+            run("ilike", menu_search.ilike_search, SessionLocal, restaurant_id, query, args.runs)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Benchmark order placement: the original per-item query / double commit path
+versus services.order_service.place_order.
+
+Runs against a throwaway SQLite file (so commits really hit the disk) and
+prints orders/sec and statements per order for 1, 10 and 50 line items.
+First checks that an order without items is rejected and stages no rows.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_order_placement [--orders 200]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app import models, schemas
+from app.db.base import Base
+from app.services.order_service import place_order
+
+LINE_ITEM_COUNTS = [1, 10, 50]
+
+
+def legacy_create_order(db, order_in, user_id):
+    """The create_order body as it was before place_order (minus notifications)."""
+    total_amount = 0
+    order_items = []
+
+    for item_in in order_in.items:
+        menu_item = db.query(models.MenuItem).filter(models.MenuItem.id == item_in.menu_item_id).first()
+        if not menu_item or not menu_item.is_active:
+            raise ValueError(f"Menu item {item_in.menu_item_id} not available")
+        total_amount += menu_item.price * item_in.quantity
+        order_items.append({
+            "menu_item_id": item_in.menu_item_id,
+            "quantity": item_in.quantity,
+            "price": menu_item.price
+        })
+
+    order = models.Order(
+        restaurant_id=order_in.restaurant_id,
+        table_id=order_in.table_id,
+        user_id=user_id,
+        total_amount=total_amount,
+        status="pending"
+    )
+    db.add(order)
+    db.commit()
+    db.refresh(order)
+
+    for item_data in order_items:
+        db.add(models.OrderItem(order_id=order.id, **item_data))
+
+    db.commit()
+    db.refresh(order)
+
+    restaurant = db.query(models.Restaurant).filter(models.Restaurant.id == order.restaurant_id).first()
+    owner_id = restaurant.owner_id
+    return schemas.Order.model_validate(order), owner_id
+
+
+def new_create_order(db, order_in, user_id):
+    order = place_order(db, order_in, user_id)
+    order_out = schemas.Order.model_validate(order)
+    owner_id = order.restaurant.owner_id
+    db.commit()
+    return order_out, owner_id
+
+
+def seed(SessionLocal, item_count):
+    db = SessionLocal()
+    owner = models.User(email="owner@bench.local", password_hash="x", role="owner")
+    customer = models.User(email="customer@bench.local", password_hash="x")
+    db.add_all([owner, customer])
+    db.flush()
+    restaurant = models.Restaurant(owner_id=owner.id, name="Bench Bistro")
+    db.add(restaurant)
+    db.flush()
+    table = models.Table(restaurant_id=restaurant.id, table_number="1")
+    category = models.Category(restaurant_id=restaurant.id, name="Mains")
+    db.add_all([table, category])
+    db.flush()
+    items = [
+        models.MenuItem(
+            restaurant_id=restaurant.id,
+            category_id=category.id,
+            name=f"Dish {i}",
+            price=Decimal("9.50"),
+        )
+        for i in range(item_count)
+    ]
+    db.add_all(items)
+    db.commit()
+    ids = (restaurant.id, table.id, customer.id, [item.id for item in items])
+    db.close()
+    return ids
+
+
+def check_empty_order(SessionLocal, restaurant_id, table_id, user_id):
+    db = SessionLocal()
+    order_in = schemas.OrderCreate(restaurant_id=restaurant_id, table_id=table_id, items=[])
+    try:
+        place_order(db, order_in, user_id)
+    except HTTPException as e:
+        assert e.status_code == 400, f"empty order rejected with {e.status_code}, expected 400"
+    else:
+        raise AssertionError("empty order was accepted")
+    finally:
+        db.rollback()
+        db.close()
+    db = SessionLocal()
+    assert db.query(models.Order).count() == 0, "empty order left an order row behind"
+    assert db.query(models.OrderItem).count() == 0, "empty order left an item row behind"
+    db.close()
+    print("empty order: rejected with 400")
+
+
+def run(label, create, SessionLocal, engine, order_in, user_id, orders):
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    start = time.perf_counter()
+    for _ in range(orders):
+        db = SessionLocal()
+        create(db, order_in, user_id)
+        db.close()
+    elapsed = time.perf_counter() - start
+    event.remove(engine, "before_cursor_execute", count)
+    print(f"  {label:<8} {orders / elapsed:>10.1f} orders/sec  {statements / orders:>6.1f} statements/order")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=200, help="orders placed per run")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        restaurant_id, table_id, user_id, item_ids = seed(SessionLocal, max(LINE_ITEM_COUNTS))
+        check_empty_order(SessionLocal, restaurant_id, table_id, user_id)
+
+        for count in LINE_ITEM_COUNTS:
+            order_in = schemas.OrderCreate(
+                restaurant_id=restaurant_id,
+                table_id=table_id,
+                items=[schemas.OrderItemCreate(menu_item_id=item_id, quantity=2) for item_id in item_ids[:count]],
+            )
+            print(f"{count} line item(s):")
+            run("legacy", legacy_create_order, SessionLocal, engine, order_in, user_id, args.orders)
+            run("new", new_create_order, SessionLocal, engine, order_in, user_id, args.orders)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Exercise the Expo push dispatcher against a local mock push server.
+
+Compares the time request handlers spend sending N pushes the old way (one
+blocking POST per message on a new connection) with queueing them on the
+dispatcher, and how long the dispatcher takes to deliver them in batches.
+Then simulates an Expo outage to show retries, the circuit breaker pausing
+calls, and delivery resuming once the server recovers.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_push_dispatcher [--messages 500] [--latency-ms 50]
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import requests
+
+from app.services.push_dispatcher import CircuitBreaker, PushDispatcher
+
+
+class MockExpo:
+    """
+    Minimal Expo push endpoint: answers every message with an "ok" ticket
+    after `latency` seconds, or 503 while `down` is set.
+    """
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.down = False
+        self.requests = 0
+        self.messages = 0
+        self.connections = set()
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                messages = body if isinstance(body, list) else [body]
+                mock.requests += 1
+                mock.connections.add(self.client_address)
+                time.sleep(mock.latency)
+                if mock.down:
+                    payload, status = b'{"errors": [{"code": "UNAVAILABLE"}]}', 503
+                else:
+                    mock.messages += len(messages)
+                    payload = json.dumps({"data": [{"status": "ok", "id": "x"} for _ in messages]}).encode()
+                    status = 200
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/--/api/v2/push/send"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def reset(self):
+        self.requests = self.messages = 0
+        self.connections = set()
+
+
+def message(i):
+    return {"to": f"ExponentPushToken[bench-{i}]", "sound": "default", "title": "Order Update", "body": "Ready", "data": {}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=50, help="mock Expo response time")
+    args = parser.parse_args()
+
+    mock = MockExpo(args.latency_ms / 1000)
+    n = args.messages
+
+    # Old path: a blocking request per message, each on a new connection
+    start = time.perf_counter()
+    for i in range(n):
+        requests.post(mock.url, json=message(i), timeout=5)
+    blocking = time.perf_counter() - start
+    print(f"blocking posts:  {n} messages, {mock.requests} requests, {len(mock.connections)} connections, "
+          f"{blocking * 1000:.0f} ms spent in request handlers")
+
+    mock.reset()
+    dispatcher = PushDispatcher(mock.url, backoff_seconds=0.05, breaker=CircuitBreaker(3, 0.5))
+    start = time.perf_counter()
+    for i in range(n):
+        dispatcher.enqueue(message(i))
+    queued = time.perf_counter() - start
+    dispatcher.flush()
+    delivered = time.perf_counter() - start
+    print(f"dispatcher:      {n} messages, {mock.requests} requests, {len(mock.connections)} connections, "
+          f"{queued * 1000:.1f} ms spent in request handlers, all delivered after {delivered * 1000:.0f} ms")
+
+    # Outage: Expo answers 503 for 1.5 s while more messages are queued
+    mock.reset()
+    mock.down = True
+    threading.Timer(1.5, lambda: setattr(mock, "down", False)).start()
+    start = time.perf_counter()
+    for i in range(n):
+        dispatcher.enqueue(message(i))
+    dispatcher.flush()
+    stats = dispatcher.stats()
+    print(f"1.5 s outage:    {mock.messages}/{n} delivered after {(time.perf_counter() - start) * 1000:.0f} ms, "
+          f"{mock.requests} requests, {stats['retries']} retries, breaker opened {stats['breaker_opened']}x, "
+          f"now {stats['breaker']}")
+    mock.server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
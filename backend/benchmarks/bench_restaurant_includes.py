@@ -0,0 +1,119 @@
+"""
+Count the queries behind GET /restaurants/{id} for each include= shape,
+compared with the original lazy-loading serialization.
+
+Seeds a throwaway SQLite file with restaurants of growing size and prints the
+number of SQL statements per response and the mean response build time.
+Fails if any include= shape needs more queries than QUERY_BUDGETS allows, so
+a regression back to per-row lazy loading is caught whatever the menu size.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_restaurant_includes [--runs 50]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app import models, schemas
+from app.api.endpoints.restaurants import read_restaurant
+from app.db.base import Base
+
+# (tables, categories, items per category)
+SIZES = [(10, 5, 10), (40, 20, 10)]
+INCLUDES = ["", "tables", "categories", "tables,categories.items"]
+
+# Most queries a response may take, independent of the restaurant's size
+QUERY_BUDGETS = {
+    None: 4, # include omitted: everything, as before include= existed
+    "": 1,
+    "tables": 2,
+    "categories": 2,
+    "tables,categories.items": 4,
+}
+
+
+def legacy_read_restaurant(db, restaurant_id):
+    """read_restaurant as it was before include= (relationships lazy-loaded)."""
+    restaurant = db.query(models.Restaurant).filter(models.Restaurant.id == restaurant_id).first()
+    return schemas.Restaurant.model_validate(restaurant)
+
+
+def seed(SessionLocal, table_count, category_count, item_count):
+    db = SessionLocal()
+    owner = models.User(email=f"owner{table_count}@bench.local", password_hash="x", role="owner")
+    db.add(owner)
+    db.flush()
+    restaurant = models.Restaurant(owner_id=owner.id, name="Bench Bistro")
+    db.add(restaurant)
+    db.flush()
+    db.add_all([models.Table(restaurant_id=restaurant.id, table_number=str(i)) for i in range(table_count)])
+    for c in range(category_count):
+        category = models.Category(restaurant_id=restaurant.id, name=f"Category {c}")
+        db.add(category)
+        db.flush()
+        db.add_all([
+            models.MenuItem(restaurant_id=restaurant.id, category_id=category.id, name=f"Dish {c}-{i}", price=Decimal("9.50"))
+            for i in range(item_count)
+        ])
+    db.commit()
+    restaurant_id = restaurant.id
+    db.close()
+    return restaurant_id
+
+
+def run(label, read, SessionLocal, engine, runs):
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    start = time.perf_counter()
+    for _ in range(runs):
+        db = SessionLocal()
+        read(db)
+        db.close()
+    elapsed = time.perf_counter() - start
+    event.remove(engine, "before_cursor_execute", count)
+    print(f"  {label:<32} {statements / runs:>6.1f} queries  {elapsed / runs * 1000:>8.2f} ms")
+    return statements / runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=50, help="responses built per shape")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        for table_count, category_count, item_count in SIZES:
+            restaurant_id = seed(SessionLocal, table_count, category_count, item_count)
+            print(f"{table_count} tables, {category_count} categories x {item_count} items:")
+            run("legacy (lazy loads)", lambda db: legacy_read_restaurant(db, restaurant_id), SessionLocal, engine, args.runs)
+            for include in [None] + INCLUDES:
+                label = "include omitted" if include is None else f"include={include}"
+                queries = run(label, lambda db: read_restaurant(restaurant_id, include, db), SessionLocal, engine, args.runs)
+                assert queries <= QUERY_BUDGETS[include], (
+                    f"{label} took {queries:.1f} queries for {table_count} tables, "
+                    f"{category_count} categories; expected at most {QUERY_BUDGETS[include]}"
+                )
+        engine.dispose()
+    print("All include= shapes within their query budgets")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Load test Socket.IO fan-out across workers: emits per second from one
+worker to a room whose clients are spread over several workers.
+
+Each simulated worker is an AsyncServer with its own client manager from
+services.socketio_managers; clients are registered directly with the manager
+and packet delivery is counted instead of written to a socket, so the numbers
+measure the manager and its message queue only.
+
+Backends:
+    memory        in-process manager, one worker (baseline, no fan-out)
+    redis-standin Redis manager against a minimal in-process Redis pub/sub
+                  stand-in (needs the redis package, but no Redis server)
+    --url URL     any SOCKETIO_MANAGER_URL, e.g. redis://localhost:6379/0 or
+                  postgresql://user:pw@localhost/db
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_socketio_fanout [--backend redis-standin] [--workers 4] [--emits 2000]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import socketio
+
+from app.services.socketio_managers import create_client_manager
+
+ROOM = "restaurant_1"
+
+
+class RedisStandIn:
+    """
+    Just enough of the Redis protocol (SUBSCRIBE / PUBLISH) for pub/sub
+    managers to talk to, served on localhost.
+    """
+
+    def __init__(self):
+        self.subscribers = {}
+        self.writers = set()
+        self.server = None
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self._client, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        for writer in list(self.writers):
+            writer.close()
+        await self.server.wait_closed()
+
+    @staticmethod
+    def _encode(value) -> bytes:
+        if isinstance(value, int):
+            return b":%d\r\n" % value
+        if isinstance(value, list):
+            return b"*%d\r\n" % len(value) + b"".join(RedisStandIn._encode(v) for v in value)
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    async def _read_command(self, reader):
+        header = await reader.readline()
+        if not header:
+            return None
+        args = []
+        for _ in range(int(header[1:])):
+            length = int((await reader.readline())[1:])
+            args.append((await reader.readexactly(length + 2))[:-2])
+        return args
+
+    async def _client(self, reader, writer):
+        channels = set()
+        self.writers.add(writer)
+        try:
+            while True:
+                command = await self._read_command(reader)
+                if command is None:
+                    break
+                name = command[0].upper()
+                if name == b"SUBSCRIBE":
+                    for channel in command[1:]:
+                        channels.add(channel)
+                        self.subscribers.setdefault(channel, set()).add(writer)
+                        writer.write(self._encode([b"subscribe", channel, len(channels)]))
+                elif name == b"UNSUBSCRIBE":
+                    for channel in command[1:] or list(channels):
+                        channels.discard(channel)
+                        self.subscribers.get(channel, set()).discard(writer)
+                        writer.write(self._encode([b"unsubscribe", channel, len(channels)]))
+                elif name == b"PUBLISH":
+                    receivers = self.subscribers.get(command[1], set())
+                    message = self._encode([b"message", command[1], command[2]])
+                    for receiver in receivers:
+                        receiver.write(message)
+                    writer.write(self._encode(len(receivers)))
+                elif name == b"PING":
+                    writer.write(b"+PONG\r\n")
+                else:
+                    writer.write(b"+OK\r\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self.writers.discard(writer)
+            for channel in channels:
+                self.subscribers.get(channel, set()).discard(writer)
+            writer.close()
+
+
+async def make_worker(url, clients):
+    server = socketio.AsyncServer(async_mode="asgi", client_manager=create_client_manager(url))
+    server.delivered = 0
+
+    async def send_eio_packet(eio_sid, eio_pkt):
+        server.delivered += 1
+
+    server._send_eio_packet = send_eio_packet
+    server.manager_initialized = True
+    server.manager.initialize()
+    for i in range(clients):
+        sid = await server.manager.connect(f"eio-{id(server)}-{i}", "/")
+        await server.manager.enter_room(sid, "/", ROOM)
+    return server
+
+
+async def run(url, workers, clients, emits):
+    servers = [await make_worker(url, clients) for _ in range(workers)]
+    await asyncio.sleep(0.5)  # let every worker subscribe
+    expected = emits * clients * workers
+    payload = {"id": 1, "status": "preparing", "version": 2}
+
+    start = time.perf_counter()
+    for _ in range(emits):
+        await servers[0].emit("order_update", payload, room=ROOM)
+    published = time.perf_counter() - start
+    while sum(server.delivered for server in servers) < expected:
+        if time.perf_counter() - start > 60:
+            break
+        await asyncio.sleep(0.005)
+    elapsed = time.perf_counter() - start
+
+    delivered = sum(server.delivered for server in servers)
+    print(f"  {workers} worker(s) x {clients} client(s): {emits / published:>9.0f} emits/sec published, "
+          f"{emits / elapsed:>9.0f} emits/sec delivered everywhere, {delivered}/{expected} packets")
+    for server in servers:
+        if getattr(server.manager, "thread", None):
+            server.manager.thread.cancel()
+    await asyncio.gather(*(server.manager.thread for server in servers if getattr(server.manager, "thread", None)),
+                         return_exceptions=True)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backend", choices=["memory", "redis-standin"], default="redis-standin")
+    parser.add_argument("--url", help="SOCKETIO_MANAGER_URL to test instead of --backend")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--clients", type=int, default=25, help="clients in the room per worker")
+    parser.add_argument("--emits", type=int, default=2000)
+    args = parser.parse_args()
+
+    standin = None
+    url = args.url
+    if not url and args.backend == "redis-standin":
+        standin = RedisStandIn()
+        url = f"redis://127.0.0.1:{await standin.start()}/0"
+    workers = 1 if not url else args.workers
+
+    print(f"backend: {url or 'memory'}")
+    await run(url, workers, args.clients, args.emits)
+    if standin:
+        await standin.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())